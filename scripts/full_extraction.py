@@ -12,8 +12,6 @@ import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.extractors.comprehensive_data_extractor import YahooFantasyExtractor
-from src.extractors.draft_extractor import main as extract_drafts
-import json
 import logging
 from datetime import datetime
 
@@ -145,18 +143,18 @@ def main():
                     return
         
         # Log extraction plan
-        extraction_plan = []
-        if extract_leagues: extraction_plan.append("Leagues")
-        if extract_teams: extraction_plan.append("Teams")
-        if extract_rosters: extraction_plan.append("Rosters")
-        if extract_matchups: extraction_plan.append("Matchups")
-        if extract_transactions: extraction_plan.append("Transactions")
-        if extract_drafts: extraction_plan.append("Drafts")
+        extraction_plan = ', '.join(label for enabled, label in (
+            (extract_leagues, "Leagues"),
+            (extract_teams, "Teams"),
+            (extract_rosters, "Rosters"),
+            (extract_matchups, "Matchups"),
+            (extract_transactions, "Transactions"),
+            (extract_drafts, "Drafts")) if enabled)
         
-        logger.info(f"📋 EXTRACTION PLAN: {', '.join(extraction_plan)}")
+        logger.info(f"📋 EXTRACTION PLAN: {extraction_plan}")
         
         # Extract data with selective flags
-        all_data = extractor.extract_all_data(
+        extractor.extract_all_data(
             initial_batch_size=10, 
             initial_batch_delay=10,
             sport_filter=sport_filter,
@@ -194,12 +192,12 @@ def main():
         logger.info(f"📄 Data saved to: {filename}")
         
         # Print final statistics
-        total_items = sum(len(v) for v in all_data.values())
-        logger.info(f"📊 Total data points extracted: {total_items:,}")
+        counts = extractor.stats.as_dict()
+        logger.info(f"📊 Total data points extracted: {sum(counts.values()):,}")
         
-        for data_type, items in all_data.items():
-            if items:
-                logger.info(f"  📋 {data_type.title()}: {len(items):,}")
+        for data_type, count in counts.items():
+            if count:
+                logger.info(f"  📋 {data_type.title()}: {count:,}")
         
     except Exception as e:
         logger.error(f"❌ Extraction failed: {e}")
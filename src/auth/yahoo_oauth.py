@@ -17,6 +17,7 @@ import os
 import sys
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
 from dotenv import load_dotenv
@@ -364,12 +365,18 @@ class LeagueDataCollectionTask(DataCollectionTask):
         """
         all_league_data = []
         
-        for year in self.target_years:
+        # Refresh once up front so the concurrent year lookups don't race on a token refresh
+        self.oauth_handler.refresh_if_needed()
+        
+        # Fan out the independent per-year league ID lookups
+        logger.info(f"📊 Collecting league IDs for years {self.target_years}")
+        with ThreadPoolExecutor(max_workers=max(1, min(len(self.target_years), 10))) as executor:
+            year_league_ids = list(executor.map(
+                lambda year: self.oauth_handler.get_leagues(year=year), self.target_years))
+        
+        for year, league_ids in zip(self.target_years, year_league_ids):
             logger.info(f"📊 Collecting leagues for year {year}")
             
-            # Get league IDs for the year
-            league_ids = self.oauth_handler.get_leagues(year=year)
-            
             for league_id in league_ids:
                 league_data = self.oauth_handler.get_league_data(league_id)
                 if league_data:
@@ -4,38 +4,134 @@ Deploy Yahoo Fantasy Data to Heroku Postgres
 Streamlined deployment of fantasy football data to PostgreSQL
 """
 
-import json
+import csv
+import io
 import logging
 import os
 import sys
 import glob
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any
 import pandas as pd
-from sqlalchemy import create_engine, text
+from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_numeric_dtype
+from sqlalchemy import create_engine, inspect, text
+
+# Make the project root importable when run as a script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from src.utils.json_io import load_json_file
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class CsvRowStream:
+    """Read-only file object that renders rows as CSV on demand, so COPY never needs the whole table as text"""
+    
+    # Marker written for None; COPY is told to read it as NULL (WITH (NULL '\N')), so an
+    # empty string stays an empty string instead of loading as NULL
+    NULL = '\\N'
+    
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+    
+    def read(self, size: int = -1) -> str:
+        null = self.NULL
+        while size < 0 or self.buffer.tell() < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            self.writer.writerow([null if value is None else value for value in row])
+        
+        data = self.buffer.getvalue()
+        remainder = data[size:] if size >= 0 else ''
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.buffer.write(remainder)
+        return data[:size] if size >= 0 else data
+
+def psql_insert_copy(table, conn, keys, data_iter, freeze: bool = False):
+    """pandas to_sql method that streams rows into PostgreSQL COPY instead of INSERTs
+
+    With freeze=True rows are written already frozen (COPY FREEZE), which is only
+    allowed when the table was created or truncated in the same transaction.
+    """
+    columns = ', '.join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    if conn.dialect.driver == 'psycopg':
+        # psycopg 3 (postgresql+psycopg:// URLs) adapts and streams rows itself, in COPY's
+        # text format where None is sent as \N and '' stays an empty string
+        options = " WITH (FREEZE)" if freeze else ""
+        with conn.connection.dbapi_connection.cursor() as cur:
+            with cur.copy(f"COPY {table_name} ({columns}) FROM STDIN{options}") as copy:
+                for row in data_iter:
+                    copy.write_row(row)
+        return
+    
+    options = f"FORMAT csv, NULL '{CsvRowStream.NULL}'" + (", FREEZE" if freeze else "")
+    with conn.connection.cursor() as cur:
+        cur.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH ({options})", CsvRowStream(data_iter))
+
+def psql_insert_copy_frozen(table, conn, keys, data_iter):
+    """psql_insert_copy with COPY FREEZE, for tables truncated in the current transaction"""
+    psql_insert_copy(table, conn, keys, data_iter, freeze=True)
+
+def psql_insert_values(table, conn, keys, data_iter):
+    """pandas to_sql method that batches INSERTs for when COPY is unavailable"""
+    columns = ', '.join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    if conn.dialect.driver == 'psycopg':
+        # psycopg 3 pipeline mode sends every INSERT without waiting for each one's round trip
+        placeholders = ', '.join(['%s'] * len(keys))
+        dbapi_conn = conn.connection.dbapi_connection
+        with dbapi_conn.pipeline(), dbapi_conn.cursor() as cur:
+            cur.executemany(f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})", data_iter)
+        return
+    
+    from psycopg2.extras import execute_values
+    with conn.connection.cursor() as cur:
+        execute_values(cur, f"INSERT INTO {table_name} ({columns}) VALUES %s", data_iter, page_size=5000)
+
 class HerokuPostgresDeployer:
     """Streamlined Heroku Postgres deployer for fantasy football data"""
     
     # Data type mappings for cleaning
-    DATETIME_FIELDS = {'extracted_at', 'timestamp', 'acquisition_date'}
-    BOOLEAN_FIELDS = {'is_pro_league', 'is_cash_league', 'is_starter', 'is_playoffs', 
-                      'is_championship', 'is_consolation', 'is_keeper', 'is_auction_draft'}
-    NUMERIC_FIELDS = {'wins', 'losses', 'ties', 'points_for', 'points_against', 
-                      'team1_score', 'team2_score', 'faab_bid', 'faab_balance', 
-                      'pick_number', 'round_number', 'cost'}
+    DATETIME_FIELDS = frozenset({'extracted_at', 'timestamp', 'acquisition_date'})
+    BOOLEAN_FIELDS = frozenset({'is_pro_league', 'is_cash_league', 'is_starter', 'is_playoffs', 
+                                'is_championship', 'is_consolation', 'is_keeper', 'is_auction_draft'})
+    NUMERIC_FIELDS = frozenset({'wins', 'losses', 'ties', 'points_for', 'points_against', 
+                                'team1_score', 'team2_score', 'faab_bid', 'faab_balance', 
+                                'pick_number', 'round_number', 'cost'})
     
     TABLE_ORDER = ['leagues', 'teams', 'rosters', 'matchups', 'transactions', 'draft_picks']
     
+    # Static SQL statements, built once instead of on every call
+    VERSION_SQL = text("SELECT version()")
+    TABLE_COUNTS_SQL = text(" UNION ALL ".join(f"SELECT '{t}', COUNT(*) FROM {t}" for t in TABLE_ORDER))
+    TABLE_COUNT_SQL = {t: text(f"SELECT COUNT(*) FROM {t}") for t in TABLE_ORDER}
+    # CASCADE: with foreign keys in place a parent table can only be truncated together with its children
+    TRUNCATE_SQL = {t: text(f"TRUNCATE TABLE {t} RESTART IDENTITY CASCADE") for t in TABLE_ORDER}
+    LEAGUES_BY_SEASON_SQL = text("""
+        SELECT season, COUNT(*) as leagues, SUM(num_teams) as teams
+        FROM leagues GROUP BY season ORDER BY season
+    """)
+    
     def __init__(self, data_file: str, database_url: str = None):
         self.data_file = data_file
         self.database_url = database_url or os.getenv('DATABASE_URL')
         self.engine = None
+        self.conn = None
         self.data = None
+        self.copy_supported = True  # Cleared if the server rejects COPY, so later tables skip straight to INSERTs
+        
+        # Tables uploaded concurrently, each on its own pooled connection (default pool: 5 + 10 overflow)
+        try:
+            self.UPLOAD_WORKERS = max(1, int(os.getenv('DEPLOY_UPLOAD_WORKERS', '4')))
+        except ValueError:
+            logger.warning(f"⚠️ Invalid DEPLOY_UPLOAD_WORKERS={os.getenv('DEPLOY_UPLOAD_WORKERS')!r}, using 4")
+            self.UPLOAD_WORKERS = 4
         
         if not self.database_url:
             raise ValueError("DATABASE_URL required: set as environment variable or pass directly")
@@ -49,10 +145,12 @@ class HerokuPostgresDeployer:
             url = self.database_url.replace('postgres://', 'postgresql://', 1)
             self.engine = create_engine(url)
             
-            # Test connection
-            with self.engine.connect() as conn:
-                version = conn.execute(text("SELECT version()")).fetchone()[0]
-                logger.info(f"✅ Connected: {version.split()[0:2]}")
+            # Test connection, keeping it open for the schema and verify steps
+            # (upload workers check out their own pooled connections)
+            self.conn = self.engine.connect()
+            version = self.conn.execute(self.VERSION_SQL).fetchone()[0]
+            self.conn.commit()
+            logger.info(f"✅ Connected: {version.split()[0:2]}")
             
             return True
         except Exception as e:
@@ -64,15 +162,13 @@ class HerokuPostgresDeployer:
         try:
             logger.info(f"📂 Loading data from {self.data_file}...")
             
-            with open(self.data_file, 'r') as f:
-                self.data = json.load(f)
+            self.data = load_json_file(self.data_file)
             
-            # Log summary
-            total_records = sum(len(records) for records in self.data.values() if records)
-            logger.info(f"✅ Data loaded: {total_records:,} total records")
-            for table, records in self.data.items():
-                if records:
-                    logger.info(f"  📊 {table}: {len(records):,}")
+            # Log summary (one pass over the tables)
+            record_counts = {table: len(records) for table, records in self.data.items() if records}
+            logger.info(f"✅ Data loaded: {sum(record_counts.values()):,} total records")
+            for table, count in record_counts.items():
+                logger.info(f"  📊 {table}: {count:,}")
             
             return True
         except Exception as e:
@@ -87,18 +183,28 @@ class HerokuPostgresDeployer:
             with open('src/utils/yahoo_fantasy_schema.sql', 'r') as f:
                 schema_sql = f.read()
             
-            with self.engine.connect() as conn:
-                statements = [s.strip() for s in schema_sql.split(';') if s.strip()]
-                
-                for stmt in statements:
-                    if stmt.upper().startswith(('CREATE TABLE', 'CREATE VIEW', 'CREATE INDEX')):
+            conn = self.conn
+            statements = [s.strip() for s in schema_sql.split(';') if s.strip()]
+            ddl_statements = [stmt for stmt in statements
+                              if stmt.upper().startswith(('CREATE TABLE', 'CREATE VIEW', 'CREATE INDEX'))]
+            
+            if ddl_statements:
+                try:
+                    # Send all DDL as one multi-statement batch: one round trip, one transaction
+                    conn.exec_driver_sql(';\n'.join(ddl_statements))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    # Some objects already exist - apply statements one by one, each in a
+                    # savepoint so a failure doesn't abort the rest of the transaction
+                    for stmt in ddl_statements:
                         try:
-                            conn.execute(text(stmt))
+                            with conn.begin_nested():
+                                conn.execute(text(stmt))
                         except Exception as e:
                             if "already exists" not in str(e).lower():
                                 logger.warning(f"Schema warning: {e}")
-                
-                conn.commit()
+                    conn.commit()
             
             logger.info("✅ Schema created successfully")
             return True
@@ -108,19 +214,23 @@ class HerokuPostgresDeployer:
     
     def clean_dataframe(self, df: pd.DataFrame, table_name: str) -> pd.DataFrame:
         """Clean DataFrame for database upload"""
+        # Columns the JSON already delivered with the right type (e.g. real booleans and
+        # numbers, which pandas infers as bool/int/float dtypes) are left untouched
+        
         # Handle datetime fields
-        for field in self.DATETIME_FIELDS:
-            if field in df.columns:
+        for field in self.DATETIME_FIELDS.intersection(df.columns):
+            if not is_datetime64_any_dtype(df[field]):
                 df[field] = pd.to_datetime(df[field], errors='coerce')
         
-        # Handle boolean fields
-        for field in self.BOOLEAN_FIELDS:
-            if field in df.columns:
-                df[field] = df[field].astype(bool)
+        # Handle boolean fields - all of them in one bulk astype with a dtype dict
+        boolean_dtypes = {field: bool for field in self.BOOLEAN_FIELDS.intersection(df.columns)
+                          if not is_bool_dtype(df[field])}
+        if boolean_dtypes:
+            df = df.astype(boolean_dtypes, copy=False)
         
         # Handle numeric fields
-        for field in self.NUMERIC_FIELDS:
-            if field in df.columns:
+        for field in self.NUMERIC_FIELDS.intersection(df.columns):
+            if not is_numeric_dtype(df[field]):
                 df[field] = pd.to_numeric(df[field], errors='coerce')
         
         return df
@@ -221,16 +331,14 @@ class HerokuPostgresDeployer:
             if 'leagues' in self.data and self.data['leagues']:
                 original_leagues = len(self.data['leagues'])
                 
-                # Identify non-NFL leagues
+                # Identify non-NFL leagues and keep only NFL leagues in a single pass
+                nfl_leagues = []
                 for league in self.data['leagues']:
-                    if league.get('game_code') != 'nfl':
+                    if league.get('game_code') == 'nfl':
+                        nfl_leagues.append(league)
+                    else:
                         non_nfl_league_ids.add(league.get('league_id'))
-                
-                # Filter out non-NFL leagues (keep only NFL)
-                self.data['leagues'] = [
-                    league for league in self.data['leagues'] 
-                    if league.get('game_code') == 'nfl'
-                ]
+                self.data['leagues'] = nfl_leagues
                 
                 filtered_leagues = len(self.data['leagues'])
                 logger.info(f"🏈 Filtered out {original_leagues - filtered_leagues} non-NFL leagues, keeping {filtered_leagues} NFL leagues only")
@@ -295,30 +403,97 @@ class HerokuPostgresDeployer:
             logger.error(f"❌ Data preprocessing failed: {e}")
             return False
     
+    def truncate_and_load(self, conn, df: pd.DataFrame, table_name: str, method) -> None:
+        """TRUNCATE a table and append df into it within one explicitly begun transaction"""
+        # Begun explicitly rather than relying on autobegin, so the TRUNCATE can't commit on its
+        # own: a failed load leaves the old rows in place, and COPY FREEZE sees the truncation
+        with conn.begin():
+            conn.execute(self.TRUNCATE_SQL[table_name])
+            df.to_sql(table_name, conn, if_exists='append', index=False, method=method)
+    
+    def reload_table(self, conn, df: pd.DataFrame, table_name: str) -> bool:
+        """Empty an existing table and append into it, keeping its indexes and column types"""
+        try:
+            if not self.copy_supported:
+                self.truncate_and_load(conn, df, table_name, psql_insert_values)
+                return True
+            
+            try:
+                # Pre-frozen rows skip the later vacuum rewrite of every page
+                self.truncate_and_load(conn, df, table_name, psql_insert_copy_frozen)
+            except Exception as e:
+                if 'FREEZE' not in str(e).upper():
+                    raise
+                logger.warning(f"  ⚠️ COPY FREEZE refused for {table_name}, loading without it: {e}")
+                self.truncate_and_load(conn, df, table_name, psql_insert_copy)
+            return True
+        except Exception as e:
+            # e.g. the columns changed since the table was created - rebuild it instead
+            logger.warning(f"  ⚠️ Could not reload {table_name} in place, recreating it: {e}")
+            return False
+    
+    def upload_table(self, conn, table_name: str, records: list) -> int:
+        """Clean and upload one table on conn, returning the number of records uploaded"""
+        # Convert and clean data
+        df = pd.DataFrame(records)
+        df = self.clean_dataframe(df, table_name)
+        
+        # Upload to database (COPY on Postgres, or execute_values if COPY is blocked; multi-row INSERTs elsewhere)
+        if self.engine.dialect.name == 'postgresql':
+            if inspect(self.engine).has_table(table_name) and self.reload_table(conn, df, table_name):
+                logger.info(f"  ✅ {table_name} uploaded")
+                return len(records)
+            
+            if self.copy_supported:
+                try:
+                    df.to_sql(table_name, self.engine, if_exists='replace',
+                             index=False, method=psql_insert_copy)
+                except Exception as e:
+                    logger.warning(f"  ⚠️ COPY failed for {table_name}, falling back to batched INSERTs: {e}")
+                    self.copy_supported = False
+            if not self.copy_supported:
+                df.to_sql(table_name, self.engine, if_exists='replace',
+                         index=False, method=psql_insert_values)
+        else:
+            df.to_sql(table_name, self.engine, if_exists='replace', 
+                     index=False, method='multi', chunksize=1000)
+        
+        logger.info(f"  ✅ {table_name} uploaded")
+        return len(records)
+    
+    def has_foreign_keys(self) -> bool:
+        """Check whether any existing deployment table has a foreign key to another"""
+        # Checked at runtime rather than assumed from yahoo_fantasy_schema.sql: its FK tables
+        # are only created when that DDL succeeds, otherwise pandas creates plain tables
+        inspector = inspect(self.conn)
+        try:
+            return any(inspector.get_foreign_keys(table_name)
+                       for table_name in self.TABLE_ORDER if inspector.has_table(table_name))
+        finally:
+            self.conn.rollback()  # End the catalog read before uploads take their locks
+    
     def upload_data(self) -> bool:
         """Upload data to database"""
         try:
             logger.info("📤 Uploading data...")
             
-            total_uploaded = 0
-            
-            for table_name in self.TABLE_ORDER:
-                records = self.data.get(table_name, [])
-                if not records:
-                    continue
-                
+            tables = [(table_name, self.data[table_name]) for table_name in self.TABLE_ORDER if self.data.get(table_name)]
+            for table_name, records in tables:
                 logger.info(f"  📊 {table_name}: {len(records):,} records")
+            
+            if self.has_foreign_keys():
+                # Truncating a parent cascades to its children, so load parents first, one at a time
+                logger.info("  🔗 Tables have foreign keys, uploading them in order")
+                total_uploaded = sum(self.upload_table(self.conn, *table) for table in tables)
+            else:
+                # No table references another, so they can load concurrently in any order.
+                # A connection can't be shared between threads, so each worker checks out its own
+                def upload_pooled(table):
+                    with self.engine.connect() as conn:
+                        return self.upload_table(conn, *table)
                 
-                # Convert and clean data
-                df = pd.DataFrame(records)
-                df = self.clean_dataframe(df, table_name)
-                
-                # Upload to database
-                df.to_sql(table_name, self.engine, if_exists='replace', 
-                         index=False, method='multi', chunksize=1000)
-                
-                total_uploaded += len(records)
-                logger.info(f"  ✅ {table_name} uploaded")
+                with ThreadPoolExecutor(max_workers=self.UPLOAD_WORKERS) as executor:
+                    total_uploaded = sum(executor.map(upload_pooled, tables))
             
             logger.info(f"✅ Upload complete: {total_uploaded:,} records")
             return True
@@ -331,42 +506,51 @@ class HerokuPostgresDeployer:
         try:
             logger.info("🔍 Verifying and summarizing...")
             
-            with self.engine.connect() as conn:
-                logger.info("\n📊 DEPLOYMENT SUMMARY:")
-                logger.info("=" * 50)
-                
-                # Verify record counts
-                total_db_records = 0
+            conn = self.conn
+            logger.info("\n📊 DEPLOYMENT SUMMARY:")
+            logger.info("=" * 50)
+            
+            # Verify record counts - every table in a single round trip
+            counts = {}
+            try:
+                counts = dict(conn.execute(self.TABLE_COUNTS_SQL).fetchall())
+            except Exception:
+                conn.rollback()
+                # A table is missing - count them one at a time to find which
                 for table_name in self.TABLE_ORDER:
                     try:
-                        count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).fetchone()[0]
-                        expected = len(self.data.get(table_name, []))
-                        status = "✅" if count == expected else "⚠️"
-                        logger.info(f"{status} {table_name.capitalize()}: {count:,} records")
-                        total_db_records += count
-                    except:
-                        logger.info(f"❌ {table_name}: Table not found")
+                        counts[table_name] = conn.execute(self.TABLE_COUNT_SQL[table_name]).fetchone()[0]
+                    except Exception:
+                        conn.rollback()
+            
+            total_db_records = 0
+            for table_name in self.TABLE_ORDER:
+                if table_name not in counts:
+                    logger.info(f"❌ {table_name}: Table not found")
+                    continue
+                count = counts[table_name]
+                expected = len(self.data.get(table_name, []))
+                status = "✅" if count == expected else "⚠️"
+                logger.info(f"{status} {table_name.capitalize()}: {count:,} records")
+                total_db_records += count
+            
+            # League summary
+            try:
+                result = conn.execute(self.LEAGUES_BY_SEASON_SQL)
                 
-                # League summary
-                try:
-                    result = conn.execute(text("""
-                        SELECT season, COUNT(*) as leagues, SUM(num_teams) as teams
-                        FROM leagues GROUP BY season ORDER BY season
-                    """))
-                    
-                    logger.info("\n📈 LEAGUES BY SEASON:")
-                    total_leagues = total_teams = 0
-                    for season, leagues, teams in result:
-                        logger.info(f"  {season}: {leagues} leagues, {teams} teams")
-                        total_leagues += leagues
-                        total_teams += teams or 0
-                    
-                    logger.info(f"\nTOTAL: {total_leagues} leagues, {total_teams} teams")
-                except:
-                    logger.info("League summary not available")
+                logger.info("\n📈 LEAGUES BY SEASON:")
+                total_leagues = total_teams = 0
+                for season, leagues, teams in result:
+                    logger.info(f"  {season}: {leagues} leagues, {teams} teams")
+                    total_leagues += leagues
+                    total_teams += teams or 0
                 
-                logger.info(f"\nGRAND TOTAL: {total_db_records:,} database records")
-                logger.info("=" * 50)
+                logger.info(f"\nTOTAL: {total_leagues} leagues, {total_teams} teams")
+            except:
+                logger.info("League summary not available")
+            
+            logger.info(f"\nGRAND TOTAL: {total_db_records:,} database records")
+            logger.info("=" * 50)
             
             return True
         except Exception as e:
@@ -384,23 +568,27 @@ class HerokuPostgresDeployer:
             ("Verify & Summarize", self.verify_and_summarize)
         ]
         
-        for step_name, step_func in steps:
-            logger.info(f"🚀 Step: {step_name}")
-            if not step_func():
-                logger.error(f"❌ Step '{step_name}' failed")
-                return False
-        
-        return True
+        try:
+            for step_name, step_func in steps:
+                logger.info(f"🚀 Step: {step_name}")
+                if not step_func():
+                    logger.error(f"❌ Step '{step_name}' failed")
+                    return False
+            
+            return True
+        finally:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
 
 def auto_detect_data_file(pattern: str) -> str:
     """Auto-detect the most recent data file"""
     if '*' not in pattern:
         return pattern
     
-    matching_files = glob.glob(pattern)
-    if matching_files:
-        # Get most recent file
-        latest = max(matching_files, key=lambda x: x.split('_')[-1])
+    # Get most recently written file (doesn't depend on the filename's timestamp format)
+    latest = max(glob.iglob(pattern), key=os.path.getmtime, default=None)
+    if latest:
         logger.info(f"🔍 Auto-detected: {latest}")
         return latest
     
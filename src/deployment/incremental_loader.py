@@ -4,7 +4,6 @@ Incremental Database Loader with Hybrid Strategies
 Implements table-specific loading strategies to optimize performance and prevent duplicates
 """
 
-import json
 import logging
 import os
 import sys
@@ -13,6 +12,10 @@ from typing import Dict, List, Any, Set
 import pandas as pd
 from sqlalchemy import create_engine, text
 
+# Make the project root importable when run as a script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from src.utils.json_io import load_json_file
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,12 +24,12 @@ class IncrementalDatabaseLoader:
     """Hybrid incremental database loader with table-specific strategies"""
     
     # Data type mappings for cleaning
-    DATETIME_FIELDS = {'extracted_at', 'timestamp', 'acquisition_date'}
-    BOOLEAN_FIELDS = {'is_pro_league', 'is_cash_league', 'is_starter', 'is_playoffs', 
-                      'is_championship', 'is_consolation', 'is_keeper', 'is_auction_draft'}
-    NUMERIC_FIELDS = {'wins', 'losses', 'ties', 'points_for', 'points_against', 
-                      'team1_score', 'team2_score', 'faab_bid', 'faab_balance', 
-                      'pick_number', 'round_number', 'cost'}
+    DATETIME_FIELDS = frozenset({'extracted_at', 'timestamp', 'acquisition_date'})
+    BOOLEAN_FIELDS = frozenset({'is_pro_league', 'is_cash_league', 'is_starter', 'is_playoffs', 
+                                'is_championship', 'is_consolation', 'is_keeper', 'is_auction_draft'})
+    NUMERIC_FIELDS = frozenset({'wins', 'losses', 'ties', 'points_for', 'points_against', 
+                                'team1_score', 'team2_score', 'faab_bid', 'faab_balance', 
+                                'pick_number', 'round_number', 'cost'})
     
     # Table loading strategies
     TABLE_STRATEGIES = {
@@ -92,7 +95,7 @@ class IncrementalDatabaseLoader:
             
             # Fix URL for newer SQLAlchemy
             url = self.database_url.replace('postgres://', 'postgresql://', 1)
-            self.engine = create_engine(url)
+            self.engine = create_engine(url, pool_pre_ping=True, pool_recycle=300)  # Survive dropped idle connections
             
             # Test connection
             with self.engine.connect() as conn:
@@ -109,8 +112,7 @@ class IncrementalDatabaseLoader:
         try:
             logger.info(f"📂 Loading data from {self.data_file}...")
             
-            with open(self.data_file, 'r') as f:
-                self.data = json.load(f)
+            self.data = load_json_file(self.data_file)
             
             # Log summary
             total_records = sum(len(records) for records in self.data.values() if records)
@@ -127,19 +129,16 @@ class IncrementalDatabaseLoader:
     def clean_dataframe(self, df: pd.DataFrame, table_name: str) -> pd.DataFrame:
         """Clean DataFrame for database upload"""
         # Handle datetime fields
-        for field in self.DATETIME_FIELDS:
-            if field in df.columns:
-                df[field] = pd.to_datetime(df[field], errors='coerce')
+        for field in self.DATETIME_FIELDS.intersection(df.columns):
+            df[field] = pd.to_datetime(df[field], errors='coerce')
         
         # Handle boolean fields
-        for field in self.BOOLEAN_FIELDS:
-            if field in df.columns:
-                df[field] = df[field].astype(bool)
+        for field in self.BOOLEAN_FIELDS.intersection(df.columns):
+            df[field] = df[field].astype(bool)
         
         # Handle numeric fields
-        for field in self.NUMERIC_FIELDS:
-            if field in df.columns:
-                df[field] = pd.to_numeric(df[field], errors='coerce')
+        for field in self.NUMERIC_FIELDS.intersection(df.columns):
+            df[field] = pd.to_numeric(df[field], errors='coerce')
         
         # Convert numpy types to Python native types to avoid psycopg2 issues
         for col in df.columns:
@@ -431,12 +430,24 @@ class IncrementalDatabaseLoader:
                 logger.info(f"\n📈 CURRENT DATABASE STATE:")
                 total_db_records = 0
                 
+                # Find which tables exist, then count all of them in a single UNION ALL query
+                existing_tables = {row[0] for row in conn.execute(text(
+                    "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'"
+                ))}
+                counted_tables = [t for t in self.TABLE_STRATEGIES if t in existing_tables]
+                table_counts = {}
+                if counted_tables:
+                    count_query = " UNION ALL ".join(
+                        f"SELECT '{table_name}', COUNT(*) FROM {table_name}" for table_name in counted_tables
+                    )
+                    table_counts = dict(conn.execute(text(count_query)).fetchall())
+                
                 for table_name in self.TABLE_STRATEGIES.keys():
-                    try:
-                        count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).fetchone()[0]
+                    if table_name in table_counts:
+                        count = table_counts[table_name]
                         logger.info(f"  {table_name.capitalize()}: {count:,} records")
                         total_db_records += count
-                    except:
+                    else:
                         logger.info(f"  {table_name}: Table not found")
                 
                 logger.info(f"\nTOTAL DATABASE RECORDS: {total_db_records:,}")
@@ -108,21 +108,22 @@ print('=' * 30)
 
 try:
     with engine.connect() as conn:
+        # Fetch all health metrics in a single round-trip
+        leagues, max_season, matchups = conn.execute(text(
+            'SELECT (SELECT COUNT(*) FROM edw.dim_league), '
+            '(SELECT MAX(season_year) FROM edw.dim_league), '
+            '(SELECT COUNT(*) FROM edw.fact_matchup)'
+        )).one()
+        
         # Check league count
-        result = conn.execute(text('SELECT COUNT(*) FROM edw.dim_league'))
-        leagues = result.scalar()
         status = '✅' if leagues == 20 else '❌'
         print(f'{status} Leagues: {leagues} (expected: 20)')
         
         # Check matchup count
-        result = conn.execute(text('SELECT COUNT(*) FROM edw.fact_matchup'))
-        matchups = result.scalar()
         status = '✅' if matchups > 1000 else '❌'
         print(f'{status} Matchups: {matchups:,}')
         
         # Check recent season
-        result = conn.execute(text('SELECT MAX(season_year) FROM edw.dim_league'))
-        max_season = result.scalar()
         status = '✅' if max_season >= 2024 else '❌'
         print(f'{status} Latest Season: {max_season}')
         
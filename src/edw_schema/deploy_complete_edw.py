@@ -70,7 +70,7 @@ class EdwDeployment:
             if url.startswith('postgres://'):
                 url = url.replace('postgres://', 'postgresql://', 1)
             
-            self.engine = create_engine(url)
+            self.engine = create_engine(url, pool_pre_ping=True, pool_recycle=300)
             
             with self.engine.connect() as conn:
                 result = conn.execute(text("SELECT version()"))
@@ -160,29 +160,30 @@ class EdwDeployment:
             logger.info(f"📋 Found {len(create_table_stmts)} tables, {len(create_index_stmts)} indexes, {len(create_view_stmts)} views, {len(alter_stmts)} constraints")
             
             # 5. Create missing tables only (with foreign keys and constraints)
+            # Per-table progress goes to debug; the totals are logged once in the summary below
             logger.info("🏗️ Creating missing tables...")
+            import re
+            table_name_pattern = re.compile(r'CREATE\s+TABLE\s+(\w+)', re.IGNORECASE)
             tables_created = 0
             
             for stmt in create_table_stmts:
                 # Extract table name for logging
-                import re
-                match = re.search(r'CREATE\s+TABLE\s+(\w+)', stmt, re.IGNORECASE)
+                match = table_name_pattern.search(stmt)
                 table_name = match.group(1) if match else "unknown"
                 
                 if table_name in missing_tables:
                     try:
-                        logger.info(f"  📋 Creating {table_name}...")
                         cur.execute(stmt)
-                        logger.info(f"  ✅ {table_name} created successfully")
+                        logger.debug(f"  ✅ {table_name} created successfully")
                         tables_created += 1
                     except Exception as e:
                         if "already exists" in str(e).lower():
-                            logger.info(f"  ✓ {table_name} already exists")
+                            logger.debug(f"  ✓ {table_name} already exists")
                         else:
                             logger.error(f"  ❌ Failed to create {table_name}: {e}")
                             # Continue with next table
                 else:
-                    logger.info(f"  ✓ {table_name} already exists")
+                    logger.debug(f"  ✓ {table_name} already exists")
             
             # 6. Create indexes (performance optimization)
             logger.info("📋 Creating indexes...")
@@ -377,19 +378,31 @@ class EdwDeployment:
             verification_passed = True
             
             with self.engine.connect() as conn:
-                # 1. Check dimension table counts
-                logger.info("📊 Verifying dimension tables...")
                 dimension_tables = {
                     'dim_season': self.expected_counts['seasons'],
                     'dim_league': self.expected_counts['leagues'],
                     'dim_team': self.expected_counts['teams'],
                     'dim_week': None
                 }
+                fact_tables = {
+                    'fact_roster': None,  # Variable based on roster data availability
+                    'fact_matchup': self.expected_counts['matchups'],
+                    'fact_transaction': self.expected_counts['transactions'],
+                    'fact_draft': self.expected_counts['draft_picks']
+                }
+                
+                # Count every dimension and fact table in a single round-trip
+                count_query = ' UNION ALL '.join(
+                    f"SELECT '{table}', COUNT(*) FROM edw.{table}"
+                    for table in (*dimension_tables, *fact_tables)
+                )
+                table_counts = dict(conn.execute(text(count_query)).fetchall())
                 
+                # 1. Check dimension table counts
+                logger.info("📊 Verifying dimension tables...")
                 total_dimension_records = 0
                 for table, expected in dimension_tables.items():
-                    result = conn.execute(text(f'SELECT COUNT(*) FROM edw.{table}'))
-                    actual = result.scalar()
+                    actual = table_counts[table]
                     total_dimension_records += actual
                     
                     if expected and actual != expected:
@@ -401,17 +414,9 @@ class EdwDeployment:
                 
                 # 2. Check fact table counts
                 logger.info("📊 Verifying fact tables...")
-                fact_tables = {
-                    'fact_roster': None,  # Variable based on roster data availability
-                    'fact_matchup': self.expected_counts['matchups'],
-                    'fact_transaction': self.expected_counts['transactions'],
-                    'fact_draft': self.expected_counts['draft_picks']
-                }
-                
                 total_fact_records = 0
                 for table, expected in fact_tables.items():
-                    result = conn.execute(text(f'SELECT COUNT(*) FROM edw.{table}'))
-                    actual = result.scalar()
+                    actual = table_counts[table]
                     total_fact_records += actual
                     
                     if expected and actual < expected * 0.9:
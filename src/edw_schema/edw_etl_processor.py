@@ -4,7 +4,6 @@ Fantasy Football EDW ETL Processor - Integrated with Incremental Loader
 Transforms operational data into analytical dimensional model
 """
 
-import json
 import logging
 import os
 import sys
@@ -16,6 +15,10 @@ from sqlalchemy.orm import sessionmaker
 from dataclasses import dataclass
 import hashlib
 
+# Make the project root importable when run as a script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from src.utils.json_io import load_json_file
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -109,6 +112,31 @@ class EdwEtlProcessor:
         }
     }
     
+    # Data marts in dependency order (after facts), mapped to their transform methods
+    MART_TRANSFORMS = {
+        'mart_league_summary': 'transform_mart_league_summary',
+        'mart_manager_performance': 'transform_mart_manager_performance',
+        'mart_player_value': 'transform_mart_player_value',
+        'mart_weekly_power_rankings': 'transform_mart_weekly_power_rankings',
+        'mart_manager_h2h': 'transform_mart_manager_h2h'
+    }
+    
+    # Metadata statements run once per operational table - compiled once and reused
+    METADATA_LOOKUP_SQL = text("""
+        SELECT record_count, last_processed_at 
+        FROM edw.edw_metadata 
+        WHERE table_name = :table
+    """)
+    METADATA_UPSERT_SQL = text("""
+        INSERT INTO edw.edw_metadata (table_name, last_processed_at, record_count, checksum)
+        VALUES (:table, :timestamp, :count, 'placeholder')
+        ON CONFLICT (table_name) 
+        DO UPDATE SET 
+            last_processed_at = :timestamp,
+            record_count = :count,
+            checksum = 'placeholder'
+    """)
+    
     def __init__(self, database_url: str = None, data_file: str = None, force_rebuild: bool = False):
         self.database_url = database_url or os.getenv('DATABASE_URL')
         self.data_file = data_file
@@ -116,6 +144,7 @@ class EdwEtlProcessor:
         self.engine = None
         self.session = None
         self.data = None
+        self.league_of_record_seasons = None  # league_id -> season_year, cached per loaded dataset
         self.load_stats = {
             'tables_processed': 0,
             'dimensions_processed': 0,
@@ -154,7 +183,9 @@ class EdwEtlProcessor:
             
             # Fix URL for newer SQLAlchemy
             url = self.database_url.replace('postgres://', 'postgresql://', 1)
-            self.engine = create_engine(url)
+            # The ETL runs long between queries; ping and recycle pooled connections so
+            # Heroku Postgres dropping an idle connection doesn't fail the next step
+            self.engine = create_engine(url, pool_pre_ping=True, pool_recycle=300)
             
             # Create session
             Session = sessionmaker(bind=self.engine)
@@ -179,8 +210,8 @@ class EdwEtlProcessor:
         try:
             logger.info(f"📂 Loading operational data from {self.data_file}...")
             
-            with open(self.data_file, 'r') as f:
-                self.data = json.load(f)
+            self.data = load_json_file(self.data_file)
+            self.league_of_record_seasons = None
             
             # Log summary
             total_records = sum(len(records) for records in self.data.values() if records)
@@ -201,16 +232,20 @@ class EdwEtlProcessor:
             logger.info("📊 Loading data from operational database tables...")
             
             self.data = {}
+            self.league_of_record_seasons = None
             operational_tables = ['leagues', 'teams', 'rosters', 'matchups', 'transactions', 'draft_picks']
             
             with self.engine.connect() as conn:
                 for table in operational_tables:
                     try:
-                        # Load all records from operational table
-                        result = conn.execute(text(f"SELECT * FROM {table}"))
+                        # Stream records through a server-side cursor so the driver never
+                        # buffers the whole table alongside the converted records
+                        result = conn.execution_options(stream_results=True, max_row_buffer=1000).execute(
+                            text(f"SELECT * FROM {table}")
+                        )
                         records = []
-                        for row in result:
-                            record = dict(row._mapping)
+                        for row in result.mappings():
+                            record = dict(row)
                             # Convert any datetime fields to strings for consistency
                             for key, value in record.items():
                                 if isinstance(value, (datetime, date)):
@@ -277,11 +312,7 @@ class EdwEtlProcessor:
                             current_count = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).fetchone()[0]
                             
                             # Get last processed info
-                            last_info = conn.execute(text("""
-                                SELECT record_count, last_processed_at 
-                                FROM edw.edw_metadata 
-                                WHERE table_name = :table
-                            """), {"table": table}).fetchone()
+                            last_info = conn.execute(self.METADATA_LOOKUP_SQL, {"table": table}).fetchone()
                             
                             if not last_info or last_info[0] != current_count:
                                 logger.info(f"📈 {table}: Changed (count: {last_info[0] if last_info else 0} → {current_count})")
@@ -308,17 +339,7 @@ class EdwEtlProcessor:
             with self.engine.connect() as conn:
                 current_count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).fetchone()[0]
                 
-                upsert_metadata = """
-                    INSERT INTO edw.edw_metadata (table_name, last_processed_at, record_count, checksum)
-                    VALUES (:table, :timestamp, :count, 'placeholder')
-                    ON CONFLICT (table_name) 
-                    DO UPDATE SET 
-                        last_processed_at = :timestamp,
-                        record_count = :count,
-                        checksum = 'placeholder'
-                """
-                
-                conn.execute(text(upsert_metadata), {
+                conn.execute(self.METADATA_UPSERT_SQL, {
                     "table": table_name,
                     "timestamp": datetime.now(),
                     "count": current_count
@@ -336,19 +357,20 @@ class EdwEtlProcessor:
             logger.warning("⚠️ No data available for season extraction")
             return list(seasons.values())
         
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if season_year not in seasons:
-                seasons[season_year] = {
-                    'season_year': season_year,
-                    'season_start_date': date(season_year, 9, 1),  # Approximate NFL season start
-                    'season_end_date': date(season_year + 1, 1, 31),  # Approximate end
-                    'playoff_start_week': 15,  # Standard fantasy playoffs
-                    'championship_week': 17,
-                    'total_weeks': 17,
-                    'is_current_season': season_year == datetime.now().year,
-                    'season_status': 'completed' if season_year < datetime.now().year else 'active'
-                }
+        current_year = datetime.now().year
+        
+        # Collect the distinct seasons first (first-seen order), then build each record once
+        for season_year in dict.fromkeys(int(league['season']) for league in self.data.get('leagues', [])):
+            seasons[season_year] = {
+                'season_year': season_year,
+                'season_start_date': date(season_year, 9, 1),  # Approximate NFL season start
+                'season_end_date': date(season_year + 1, 1, 31),  # Approximate end
+                'playoff_start_week': 15,  # Standard fantasy playoffs
+                'championship_week': 17,
+                'total_weeks': 17,
+                'is_current_season': season_year == current_year,
+                'season_status': 'completed' if season_year < current_year else 'active'
+            }
         
         return list(seasons.values())
     
@@ -361,22 +383,21 @@ class EdwEtlProcessor:
         for league in self.data.get('leagues', []):
             league_to_season[league['league_id']] = int(league['season'])
         
-        # Extract from matchup data (has week information)
-        for matchup in self.data.get('matchups', []):
-            # Get season from league mapping instead of defaulting to 2024
-            season_year = league_to_season.get(matchup['league_id'], 2024)
-            week_number = matchup['week']
-            
-            key = (season_year, week_number)
-            if key not in weeks:
-                weeks[key] = {
-                    'season_year': season_year,
-                    'week_number': week_number,
-                    'week_type': self.classify_week_type(week_number),
-                    'week_start_date': None,  # Could calculate based on season
-                    'week_end_date': None,
-                    'is_current_week': False  # Will be updated based on current logic
-                }
+        # Extract from matchup data (has week information) - distinct (season, week) keys in first-seen order,
+        # with season from the league mapping instead of defaulting to 2024
+        week_keys = dict.fromkeys(
+            (league_to_season.get(matchup['league_id'], 2024), matchup['week'])
+            for matchup in self.data.get('matchups', []))
+        
+        for season_year, week_number in week_keys:
+            weeks[(season_year, week_number)] = {
+                'season_year': season_year,
+                'week_number': week_number,
+                'week_type': self.classify_week_type(week_number),
+                'week_start_date': None,  # Could calculate based on season
+                'week_end_date': None,
+                'is_current_week': False  # Will be updated based on current logic
+            }
         
         return list(weeks.values())
     
@@ -397,10 +418,12 @@ class EdwEtlProcessor:
             logger.warning("⚠️ No data available for league transformation")
             return transformed
         
+        league_seasons = self.get_league_of_record_seasons()
+        
         for league in self.data.get('leagues', []):
             season_year = int(league['season'])
-            # Use the comprehensive league of record check
-            if not self.is_league_of_record(league['league_id'], season_year):
+            # Use the comprehensive league of record check (cached per dataset)
+            if league['league_id'] not in league_seasons:
                 continue
                 
             transformed.append({
@@ -426,12 +449,8 @@ class EdwEtlProcessor:
             logger.warning("⚠️ No data available for team transformation")
             return transformed
         
-        # Build set of league of record IDs for efficient lookup
-        league_of_record_ids = set()
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if self.is_league_of_record(league['league_id'], season_year):
-                league_of_record_ids.add(league['league_id'])
+        # Leagues of record are resolved once per loaded dataset and reused by every transform
+        league_of_record_ids = self.get_league_of_record_seasons().keys()
         
         # Cache manager keys for lookup
         manager_keys = self.dim_mappings.get('manager_keys', {})
@@ -536,12 +555,8 @@ class EdwEtlProcessor:
             logger.info("🏈 No roster data available - skipping fact_roster")
             return facts
 
-        # Build set of league of record IDs for efficient lookup
-        league_of_record_ids = set()
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if self.is_league_of_record(league['league_id'], season_year):
-                league_of_record_ids.add(league['league_id'])
+        # Leagues of record indexed by ID so each roster is an O(1) season lookup
+        league_seasons = self.get_league_of_record_seasons()
 
         # Use cached dimension mappings (no database queries in loop)
         league_keys = self.dim_mappings.get('league_keys', {})
@@ -552,16 +567,7 @@ class EdwEtlProcessor:
         
         for roster in rosters_data:
             # Only include rosters from leagues of record
-            if roster['league_id'] not in league_of_record_ids:
-                continue
-                
-            # Extract league info to get season
-            season_year = None
-            for league in self.data.get('leagues', []):
-                if league['league_id'] == roster['league_id']:
-                    season_year = int(league['season'])
-                    break
-            
+            season_year = league_seasons.get(roster['league_id'])
             if not season_year:
                 continue
                 
@@ -578,6 +584,10 @@ class EdwEtlProcessor:
             player_key = player_keys.get(numeric_player_id)
             week_key = week_keys.get((season_year, roster['week']))
             
+            # Bail out before manager consolidation when a dimension key is already missing
+            if not all((league_key, team_key, player_key, week_key)):
+                continue
+            
             # Get manager_key from team's manager_name
             manager_key = None
             raw_manager_name = roster.get('manager_name')
@@ -585,7 +595,7 @@ class EdwEtlProcessor:
                 consolidated_manager_name = self.consolidate_manager_name(raw_manager_name)
                 manager_key = manager_keys.get(consolidated_manager_name)
             
-            if not all([league_key, team_key, player_key, week_key, manager_key]):
+            if not manager_key:
                 continue
             
             facts.append({
@@ -616,14 +626,8 @@ class EdwEtlProcessor:
             logger.warning("⚠️ No data available for matchup fact transformation")
             return facts
 
-        # Build league-to-season mapping and league of record set for efficient lookup
-        league_to_season = {}
-        league_of_record_ids = set()
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if self.is_league_of_record(league['league_id'], season_year):
-                league_to_season[league['league_id']] = season_year
-                league_of_record_ids.add(league['league_id'])
+        # League-to-season mapping for leagues of record, resolved once per loaded dataset
+        league_to_season = self.get_league_of_record_seasons()
 
         # Use cached dimension mappings (no database queries in loop)
         league_keys = self.dim_mappings.get('league_keys', {})
@@ -631,9 +635,12 @@ class EdwEtlProcessor:
         manager_keys = self.dim_mappings.get('manager_keys', {})
         week_keys = self.dim_mappings.get('week_keys', {})
         
+        # Index teams by ID once instead of scanning every team per matchup
+        teams_by_id = {team['team_id']: team for team in self.data.get('teams', [])}
+        
         for matchup in self.data.get('matchups', []):
             # Only include matchups from leagues of record
-            if matchup['league_id'] not in league_of_record_ids:
+            if matchup['league_id'] not in league_to_season:
                 continue
                 
             # Get season from league mapping
@@ -647,17 +654,14 @@ class EdwEtlProcessor:
             # Get manager keys for both teams
             manager1_key = None
             manager2_key = None
-            for team in self.data.get('teams', []):
-                if team['team_id'] == matchup['team1_id']:
-                    raw_manager_name = team.get('manager_name')
-                    if raw_manager_name:
-                        consolidated_manager_name = self.consolidate_manager_name(raw_manager_name)
-                        manager1_key = manager_keys.get(consolidated_manager_name)
-                elif team['team_id'] == matchup['team2_id']:
-                    raw_manager_name = team.get('manager_name')
-                    if raw_manager_name:
-                        consolidated_manager_name = self.consolidate_manager_name(raw_manager_name)
-                        manager2_key = manager_keys.get(consolidated_manager_name)
+            team1 = teams_by_id.get(matchup['team1_id'])
+            if team1 and team1.get('manager_name'):
+                consolidated_manager_name = self.consolidate_manager_name(team1['manager_name'])
+                manager1_key = manager_keys.get(consolidated_manager_name)
+            team2 = teams_by_id.get(matchup['team2_id'])
+            if team2 and team2.get('manager_name'):
+                consolidated_manager_name = self.consolidate_manager_name(team2['manager_name'])
+                manager2_key = manager_keys.get(consolidated_manager_name)
             
             if not all([league_key, team1_key, team2_key, week_key, manager1_key, manager2_key]):
                 continue
@@ -714,18 +718,14 @@ class EdwEtlProcessor:
             logger.warning("⚠️ No data available for transaction fact transformation")
             return facts
 
-        # Build set of league of record IDs for efficient lookup
-        league_of_record_ids = set()
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if self.is_league_of_record(league['league_id'], season_year):
-                league_of_record_ids.add(league['league_id'])
+        # Leagues of record are resolved once per loaded dataset and reused by every transform
+        league_of_record_ids = self.get_league_of_record_seasons().keys()
 
         # Use cached dimension mappings (no database queries in loop)
         league_keys = self.dim_mappings.get('league_keys', {})
         team_keys = self.dim_mappings.get('team_keys', {})
-        manager_keys = self.dim_mappings.get('manager_keys', {})
         player_keys = self.dim_mappings.get('player_keys', {})
+        team_manager_keys = self.build_team_manager_keys()
         
         for transaction in self.data.get('transactions', []):
             # Only include transactions from leagues of record
@@ -744,7 +744,8 @@ class EdwEtlProcessor:
             player_key = player_keys.get(numeric_player_id)
             
             if not all([league_key, player_key]):
-                logger.debug(f"⚠️ Missing keys for transaction: league={league_key}, player={player_key} (raw={raw_player_id}, numeric={numeric_player_id})")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"⚠️ Missing keys for transaction: league={league_key}, player={player_key} (raw={raw_player_id}, numeric={numeric_player_id})")
                 continue
             
             # Parse timestamp properly - handle different formats
@@ -756,7 +757,7 @@ class EdwEtlProcessor:
                     # Already in datetime format
                     transaction_date = datetime.strptime(transaction['timestamp'], '%Y-%m-%d %H:%M:%S').date()
             except (ValueError, KeyError):
-                logger.warning(f"⚠️ Could not parse timestamp for transaction: {transaction.get('timestamp')}")
+                logger.warning("⚠️ Could not parse timestamp for transaction: %s", transaction.get('timestamp'))
                 continue
             
             # Extract season from the timestamp (assume NFL season starts in September)
@@ -767,32 +768,11 @@ class EdwEtlProcessor:
                 season_year = transaction_date.year - 1
             
             # Get manager keys for from/to teams
-            from_manager_key = None
-            to_manager_key = None
-            
-            if transaction.get('source_team_id'):
-                for team in self.data.get('teams', []):
-                    if team['team_id'] == transaction['source_team_id']:
-                        raw_manager_name = team.get('manager_name')
-                        if raw_manager_name:
-                            consolidated_manager_name = self.consolidate_manager_name(raw_manager_name)
-                            from_manager_key = manager_keys.get(consolidated_manager_name)
-                        break
-                        
-            if transaction.get('destination_team_id'):
-                for team in self.data.get('teams', []):
-                    if team['team_id'] == transaction['destination_team_id']:
-                        raw_manager_name = team.get('manager_name')
-                        if raw_manager_name:
-                            consolidated_manager_name = self.consolidate_manager_name(raw_manager_name)
-                            to_manager_key = manager_keys.get(consolidated_manager_name)
-                        break
-            
-            # Generate a unique transaction_id
-            transaction_id = f"{transaction['league_id']}_{transaction['player_id']}_{transaction_date.strftime('%Y%m%d')}_{transaction['type']}"
+            from_manager_key = team_manager_keys.get(transaction.get('source_team_id'))
+            to_manager_key = team_manager_keys.get(transaction.get('destination_team_id'))
             
+            # fact_transaction is keyed by its SERIAL transaction_key, so no string id is built per row
             facts.append({
-                'transaction_id': transaction_id,
                 'league_key': int(league_key),
                 'player_key': int(player_key),
                 'season_year': int(season_year),
@@ -819,18 +799,14 @@ class EdwEtlProcessor:
             logger.warning("⚠️ No data available for draft fact transformation")
             return facts
 
-        # Build set of league of record IDs for efficient lookup
-        league_of_record_ids = set()
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if self.is_league_of_record(league['league_id'], season_year):
-                league_of_record_ids.add(league['league_id'])
+        # Leagues of record are resolved once per loaded dataset and reused by every transform
+        league_of_record_ids = self.get_league_of_record_seasons().keys()
 
         # Use cached dimension mappings (no database queries in loop)
         league_keys = self.dim_mappings.get('league_keys', {})
         team_keys = self.dim_mappings.get('team_keys', {})
-        manager_keys = self.dim_mappings.get('manager_keys', {})
         player_keys = self.dim_mappings.get('player_keys', {})
+        team_manager_keys = self.build_team_manager_keys()
         
         for draft_pick in self.data.get('draft_picks', []):
             # Only include draft picks from leagues of record
@@ -848,17 +824,11 @@ class EdwEtlProcessor:
             team_key = team_keys.get(full_team_id)
             
             # Get manager_key from team's manager_name
-            manager_key = None
-            for team in self.data.get('teams', []):
-                if team['team_id'] == full_team_id:
-                    raw_manager_name = team.get('manager_name')
-                    if raw_manager_name:
-                        consolidated_manager_name = self.consolidate_manager_name(raw_manager_name)
-                        manager_key = manager_keys.get(consolidated_manager_name)
-                    break
+            manager_key = team_manager_keys.get(full_team_id)
             
             if not all([league_key, team_key, player_key, manager_key]):
-                logger.debug(f"⚠️ Missing keys for draft pick: league={league_key}, team={team_key} (raw={raw_team_id}, full={full_team_id}), player={player_key}, manager={manager_key}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"⚠️ Missing keys for draft pick: league={league_key}, team={team_key} (raw={raw_team_id}, full={full_team_id}), player={player_key}, manager={manager_key}")
                 continue
             
             # Extract season from extracted_at timestamp
@@ -904,19 +874,13 @@ class EdwEtlProcessor:
         # Calculate team performance metrics from matchups and rosters
         team_performance = {}
         
-        # Build league-to-season mapping and league of record set for efficient lookup
-        league_to_season = {}
-        league_of_record_ids = set()
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if self.is_league_of_record(league['league_id'], season_year):
-                league_to_season[league['league_id']] = season_year
-                league_of_record_ids.add(league['league_id'])
+        # League-to-season mapping for leagues of record, resolved once per loaded dataset
+        league_to_season = self.get_league_of_record_seasons()
         
         # Process matchups for wins/losses/points (only for leagues of record)
         for matchup in self.data.get('matchups', []):
             # Only include matchups from leagues of record
-            if matchup['league_id'] not in league_of_record_ids:
+            if matchup['league_id'] not in league_to_season:
                 continue
                 
             season_year = league_to_season.get(matchup['league_id'], 2024)
@@ -927,32 +891,30 @@ class EdwEtlProcessor:
                 team_points = float(matchup.get(f'team{team_num}_score', 0))
                 opponent_points = float(matchup.get(f'team{3-team_num}_score', 0))
                 
-                key = (team_id, season_year, week)
-                if key not in team_performance:
-                    team_performance[key] = {
-                        'team_id': team_id,
-                        'league_id': matchup['league_id'],
-                        'season_year': season_year,
-                        'week': week,
-                        'wins': 0,
-                        'losses': 0,
-                        'ties': 0,
-                        'weekly_points': team_points,
-                        'points_against': opponent_points
-                    }
+                perf = team_performance.setdefault((team_id, season_year, week), {
+                    'team_id': team_id,
+                    'league_id': matchup['league_id'],
+                    'season_year': season_year,
+                    'week': week,
+                    'wins': 0,
+                    'losses': 0,
+                    'ties': 0,
+                    'weekly_points': team_points,
+                    'points_against': opponent_points
+                })
                 
                 if team_points > opponent_points:
-                    team_performance[key]['wins'] = 1
+                    perf['wins'] = 1
                 elif team_points < opponent_points:
-                    team_performance[key]['losses'] = 1
+                    perf['losses'] = 1
                 else:
-                    team_performance[key]['ties'] = 1
+                    perf['ties'] = 1
         
         # Convert to fact format with dimension keys (use cached mappings)
         league_keys = self.dim_mappings.get('league_keys', {})
         team_keys = self.dim_mappings.get('team_keys', {})
-        manager_keys = self.dim_mappings.get('manager_keys', {})
         week_keys = self.dim_mappings.get('week_keys', {})
+        team_manager_keys = self.build_team_manager_keys()
         
         for perf in team_performance.values():
             team_key = team_keys.get(perf['team_id'])
@@ -960,15 +922,7 @@ class EdwEtlProcessor:
             week_key = week_keys.get((perf['season_year'], perf['week']))
             
             # Get manager_key from team's manager_name
-            manager_key = None
-            # Find team info to get manager_name
-            for team in self.data.get('teams', []):
-                if team['team_id'] == perf['team_id']:
-                    raw_manager_name = team.get('manager_name')
-                    if raw_manager_name:
-                        consolidated_manager_name = self.consolidate_manager_name(raw_manager_name)
-                        manager_key = manager_keys.get(consolidated_manager_name)
-                    break
+            manager_key = team_manager_keys.get(perf['team_id'])
             
             if not all([team_key, league_key, week_key, manager_key]):
                 continue
@@ -1210,18 +1164,10 @@ class EdwEtlProcessor:
             logger.info("🏪 Loading data mart tables...")
             
             # Load marts in dependency order (after facts)
-            mart_methods = [
-                ("mart_league_summary", self.transform_mart_league_summary),
-                ("mart_manager_performance", self.transform_mart_manager_performance),
-                ("mart_player_value", self.transform_mart_player_value),
-                ("mart_weekly_power_rankings", self.transform_mart_weekly_power_rankings),
-                ("mart_manager_h2h", self.transform_mart_manager_h2h)
-            ]
-            
-            for table_name, transform_method in mart_methods:
+            for table_name, transform_method_name in self.MART_TRANSFORMS.items():
                 try:
                     logger.info(f"  🏪 Processing {table_name}...")
-                    data = transform_method()
+                    data = getattr(self, transform_method_name)()
                     if self.load_mart_table(table_name, data):
                         logger.info(f"  ✅ {table_name.title()}: {len(data)} processed")
                     else:
@@ -1566,9 +1512,9 @@ class EdwEtlProcessor:
         try:
             logger.info(f"🏪 Processing data mart: {table_name}")
             
-            # Get transformation function
-            transform_method_name = f"transform_{table_name}"
-            if hasattr(self, transform_method_name):
+            # Get transformation function from the static mart registry
+            transform_method_name = self.MART_TRANSFORMS.get(table_name)
+            if transform_method_name:
                 transform_method = getattr(self, transform_method_name)
                 logger.info(f"🔄 Transforming data for {table_name}...")
                 data = transform_method()
@@ -1628,6 +1574,29 @@ class EdwEtlProcessor:
         
         return True
     
+    def copy_dataframe(self, conn, table_name: str, df: pd.DataFrame) -> None:
+        """Bulk load a DataFrame into edw.<table_name> with COPY FROM STDIN in the current transaction"""
+        import io
+        
+        df_copy = df.copy()
+        # Nullable integer keys arrive as floats (NaN for NULL); write them as integers for COPY
+        for column in df_copy.select_dtypes(include='float').columns:
+            values = df_copy[column].dropna()
+            if len(values) and (values == values.round()).all():
+                df_copy[column] = df_copy[column].astype('Int64')
+        
+        # Create StringIO buffer with CSV data (PostgreSQL NULL representation in COPY is \N)
+        output = io.StringIO()
+        df_copy.to_csv(output, sep='\t', header=False, index=False, na_rep='\\N')
+        output.seek(0)
+        
+        columns = df_copy.columns.tolist()
+        copy_sql = f"COPY edw.{table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t', NULL '\\N')"
+        
+        # Execute COPY on the raw psycopg2 connection inside the caller's begun transaction
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(copy_sql, output)
+    
     def load_fact_table(self, table_name: str, data: List[Dict]) -> bool:
         """Load data into fact table with proper incremental loading strategy"""
         try:
@@ -1640,45 +1609,18 @@ class EdwEtlProcessor:
             # Convert to DataFrame for processing
             df = pd.DataFrame(data)
             
-            with self.engine.connect() as conn:
+            # Explicit transaction: COPY runs on the raw DBAPI cursor, which SQLAlchemy does not
+            # see, so without one nothing would have begun and the pool would roll the rows back
+            with self.engine.begin() as conn:
                 if self.force_rebuild:
                     # Force rebuild: truncate and reload all data
                     logger.info(f"🗑️ Force rebuild: Truncating {table_name}...")
                     conn.execute(text(f"TRUNCATE TABLE edw.{table_name} RESTART IDENTITY CASCADE"))
                     
-                    if table_name == 'fact_roster':
-                        # Use PostgreSQL COPY FROM STDIN for ultra-fast bulk insert
-                        import io
-                        logger.info(f"🚀 Using COPY FROM STDIN for {len(df)} roster records...")
-                        
-                        # Create StringIO buffer with CSV data
-                        output = io.StringIO()
-                        
-                        # Write data to buffer (handle NaN values)
-                        df_clean = df.copy()
-                        df_clean = df_clean.fillna('\\N')  # PostgreSQL NULL representation in COPY
-                        df_clean.to_csv(output, sep='\t', header=False, index=False, na_rep='\\N')
-                        output.seek(0)
-                        
-                        # Get column names for COPY command
-                        columns = df.columns.tolist()
-                        copy_sql = f"COPY edw.{table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t', NULL '\\N')"
-                        
-                        # Execute COPY command using raw psycopg2 connection
-                        raw_conn = conn.connection
-                        with raw_conn.cursor() as cursor:
-                            try:
-                                cursor.copy_expert(copy_sql, output)
-                                raw_conn.commit()
-                                logger.info(f"✅ Successfully bulk loaded {len(df):,} roster records via COPY")
-                            except Exception as e:
-                                raw_conn.rollback()
-                                logger.error(f"❌ COPY failed: {e}")
-                                raise e
-                    else:
-                        # Use standard pandas to_sql for other fact tables
-                        logger.info(f"⚡ Bulk inserting {len(df)} {table_name} records using pandas...")
-                        df.to_sql(table_name, conn, schema='edw', if_exists='append', index=False)
+                    # Use PostgreSQL COPY FROM STDIN for ultra-fast bulk insert
+                    logger.info(f"🚀 Using COPY FROM STDIN for {len(df)} {table_name} records...")
+                    self.copy_dataframe(conn, table_name, df)
+                    logger.info(f"✅ Successfully bulk loaded {len(df):,} {table_name} records via COPY")
                 else:
                     # Incremental loading: implement proper upsert strategies
                     logger.info(f"🔄 Using incremental loading strategy for {table_name}")
@@ -1701,27 +1643,22 @@ class EdwEtlProcessor:
                         
                         # Insert new data
                         logger.info(f"⚡ Inserting {len(df)} new records...")
-                        df.to_sql(table_name, conn, schema='edw', if_exists='append', index=False)
+                        self.copy_dataframe(conn, table_name, df)
                         
                     elif table_name in ['fact_transaction', 'fact_draft']:
                         # Append-only tables: use bulk insert (let database handle duplicates)
                         logger.info(f"🔄 Using bulk insert for append-only table {table_name}")
                         
-                        # Remove transaction_id column if it exists (not in table schema)
-                        if 'transaction_id' in df.columns:
-                            df = df.drop('transaction_id', axis=1)
-                            
                         # Use bulk insert
-                        df.to_sql(table_name, conn, schema='edw', if_exists='append', index=False)
+                        self.copy_dataframe(conn, table_name, df)
                         logger.info(f"✅ Bulk inserted {len(df)} records")
                         
                     else:
                         logger.warning(f"⚠️ No incremental loading strategy for {table_name}, using bulk insert")
-                        df.to_sql(table_name, conn, schema='edw', if_exists='append', index=False)
-                
-                conn.commit()
-                logger.info(f"✅ Successfully loaded {len(data)} records into {table_name}")
-                return True
+                        self.copy_dataframe(conn, table_name, df)
+            
+            logger.info(f"✅ Successfully loaded {len(data)} records into {table_name}")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Failed to load {table_name}: {e}")
@@ -1738,7 +1675,7 @@ class EdwEtlProcessor:
         """
         # Never include manually excluded leagues
         if league_id in self.EXCLUDED_LEAGUE_IDS:
-            logger.info(f"🚫 Excluding manually excluded league: {league_id}")
+            logger.info("🚫 Excluding manually excluded league: %s", league_id)
             return False
             
         # Always include historical leagues
@@ -1747,12 +1684,22 @@ class EdwEtlProcessor:
             
         # Automatically include future leagues
         if season_year >= self.FUTURE_SEASON_THRESHOLD:
-            logger.info(f"🔄 Auto-including future league: {league_id} ({season_year})")
+            logger.info("🔄 Auto-including future league: %s (%s)", league_id, season_year)
             return True
             
         # Exclude everything else
         return False
 
+    def get_league_of_record_seasons(self) -> Dict[str, int]:
+        """Map league_id -> season_year for leagues of record, computed once per loaded dataset"""
+        if self.league_of_record_seasons is None:
+            self.league_of_record_seasons = {}
+            for league in self.data.get('leagues', []):
+                season_year = int(league['season'])
+                if self.is_league_of_record(league['league_id'], season_year):
+                    self.league_of_record_seasons[league['league_id']] = season_year
+        return self.league_of_record_seasons
+
     def log_league_filtering_config(self):
         """Log the current league filtering configuration"""
         logger.info("🏈 League of Record Filtering Configuration:")
@@ -1801,6 +1748,23 @@ class EdwEtlProcessor:
         
         return name_mapping.get(manager_name, manager_name)
 
+    def build_team_manager_keys(self) -> Dict[str, Any]:
+        """Map each team_id to its consolidated manager_key in a single pass over teams"""
+        manager_keys = self.dim_mappings.get('manager_keys', {})
+        team_manager_keys = {}
+        
+        for team in self.data.get('teams', []):
+            # Keep the first occurrence of a team, matching the previous scan-and-break lookups
+            if team['team_id'] in team_manager_keys:
+                continue
+            raw_manager_name = team.get('manager_name')
+            manager_key = None
+            if raw_manager_name:
+                manager_key = manager_keys.get(self.consolidate_manager_name(raw_manager_name))
+            team_manager_keys[team['team_id']] = manager_key
+        
+        return team_manager_keys
+
     def transform_managers(self) -> List[Dict]:
         """Transform manager data for dim_manager table - only from leagues of record with name consolidation"""
         managers = []
@@ -1809,30 +1773,22 @@ class EdwEtlProcessor:
             logger.warning("⚠️ No data available for manager transformation")
             return managers
         
-        # Build set of league of record IDs for efficient lookup (same pattern as other transforms)
-        league_of_record_ids = set()
-        for league in self.data.get('leagues', []):
-            season_year = int(league['season'])
-            if self.is_league_of_record(league['league_id'], season_year):
-                league_of_record_ids.add(league['league_id'])
-        
-        logger.info(f"🔍 Filtering teams to {len(league_of_record_ids)} leagues of record")
+        # Leagues of record (with their parsed season) are resolved once per loaded dataset
+        league_to_season = self.get_league_of_record_seasons()
         
-        # Build league lookup for efficient season retrieval
-        league_lookup = {}
-        for league in self.data.get('leagues', []):
-            league_lookup[league['league_id']] = league
+        logger.info(f"🔍 Filtering teams to {len(league_to_season)} leagues of record")
         
         # Extract unique canonical managers from teams data - only from leagues of record with name consolidation
         raw_managers = set()
-        canonical_managers = set()
+        canonical_managers = {}  # canonical name -> [(raw name, league id, season year, managers)] across all name variations
         total_teams = 0
         filtered_teams = 0
         
         for team in self.data.get('teams', []):
             total_teams += 1
-            # Only include teams from leagues of record (same pattern as transform_teams)
-            if team['league_id'] not in league_of_record_ids:
+            # Only include teams from leagues of record; one lookup gives both membership and season
+            season_year = league_to_season.get(team['league_id'])
+            if season_year is None:
                 continue
             
             filtered_teams += 1    
@@ -1841,7 +1797,8 @@ class EdwEtlProcessor:
                 raw_name = manager_name.strip()
                 canonical_name = self.consolidate_manager_name(raw_name)
                 raw_managers.add(raw_name)
-                canonical_managers.add(canonical_name)  # Only canonical names in final set
+                canonical_managers.setdefault(canonical_name, []).append(
+                    (raw_name, team['league_id'], season_year, team.get('managers')))  # Only canonical names in final set
         
         logger.info(f"👤 Processed {total_teams} total teams, kept {filtered_teams} from leagues of record")
         logger.info(f"👤 Found {len(raw_managers)} raw manager names, consolidated to {len(canonical_managers)} unique managers")
@@ -1851,51 +1808,27 @@ class EdwEtlProcessor:
             # Calculate season ranges for this manager across all name variations - only from leagues of record
             manager_seasons = []
             manager_leagues = set()
-            name_variations_found = []
             manager_data = {}  # Store the best manager data found
-            
-            for team in self.data.get('teams', []):
-                # Only include teams from leagues of record (same filtering as above)
-                if team['league_id'] not in league_of_record_ids:
-                    continue
-                    
-                raw_team_name = team.get('manager_name', '').strip()
-                if raw_team_name and self.consolidate_manager_name(raw_team_name) == canonical_name:
-                    # Track which name variations we found for this canonical manager
-                    if raw_team_name not in name_variations_found:
-                        name_variations_found.append(raw_team_name)
-                    
-                    # Collect manager data (prefer most recent or most complete)
-                    if team.get('managers'):
-                        # We have manager detail data - extract it
-                        managers_list = team.get('managers', [])
-                        if managers_list and len(managers_list) > 0:
-                            manager_info = managers_list[0].get('manager', {})
-                            if manager_info.get('manager_id') and not manager_data.get('manager_id'):
-                                manager_data['manager_id'] = manager_info.get('manager_id')
-                            if manager_info.get('email') and not manager_data.get('email'):
-                                manager_data['email'] = manager_info.get('email')
-                            if manager_info.get('nickname') and not manager_data.get('display_name'):
-                                manager_data['display_name'] = manager_info.get('nickname')
-                            if manager_info.get('image_url') and not manager_data.get('profile_image_url'):
-                                manager_data['profile_image_url'] = manager_info.get('image_url')
-                    
-                    # Get season year from league lookup (teams don't have season_year field)
-                    league_id = team.get('league_id')
-                    league = league_lookup.get(league_id)
-                    if league:
-                        season_str = league.get('season')
-                        if season_str:
-                            try:
-                                season_year = int(season_str)
-                                manager_seasons.append(season_year)
-                                manager_leagues.add(league_id)
-                            except (ValueError, TypeError):
-                                logger.warning(f"⚠️ Invalid season value '{season_str}' for league {league_id}")
-                        else:
-                            logger.warning(f"⚠️ No season field for league {league_id}")
-                    else:
-                        logger.warning(f"⚠️ League {league_id} not found in lookup")
+            manager_teams = canonical_managers[canonical_name]
+            
+            # Teams were grouped by canonical manager above, so no rescan of all teams is needed
+            for _, league_id, season_year, managers_list in manager_teams:
+                # Collect manager data (prefer most recent or most complete)
+                if managers_list:
+                    # We have manager detail data - extract it
+                    manager_info = managers_list[0].get('manager', {})
+                    if manager_info.get('manager_id') and not manager_data.get('manager_id'):
+                        manager_data['manager_id'] = manager_info.get('manager_id')
+                    if manager_info.get('email') and not manager_data.get('email'):
+                        manager_data['email'] = manager_info.get('email')
+                    if manager_info.get('nickname') and not manager_data.get('display_name'):
+                        manager_data['display_name'] = manager_info.get('nickname')
+                    if manager_info.get('image_url') and not manager_data.get('profile_image_url'):
+                        manager_data['profile_image_url'] = manager_info.get('image_url')
+                
+                # Season year was resolved with the league-of-record filter (teams don't have season_year field)
+                manager_seasons.append(season_year)
+                manager_leagues.add(league_id)
             
             # Calculate stats
             first_season = min(manager_seasons) if manager_seasons else None
@@ -1903,9 +1836,11 @@ class EdwEtlProcessor:
             total_seasons = len(set(manager_seasons)) if manager_seasons else 0
             total_leagues = len(manager_leagues)
             
-            # Log consolidation details if multiple name variations found
-            if len(name_variations_found) > 1:
-                logger.info(f"🔄 Consolidated '{canonical_name}' from variations: {name_variations_found}")
+            # Log consolidation details if multiple name variations found (only built when it will be logged)
+            if logger.isEnabledFor(logging.INFO):
+                name_variations_found = list(dict.fromkeys(raw_name for raw_name, _, _, _ in manager_teams))
+                if len(name_variations_found) > 1:
+                    logger.info("🔄 Consolidated '%s' from variations: %s", canonical_name, name_variations_found)
             
             # Generate consistent manager_id from canonical name for usability
             # Convert canonical name to a stable, URL-friendly manager ID
@@ -7,14 +7,24 @@ Extracts all available data from Yahoo Fantasy API for database storage
 import os
 import json
 import logging
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields, is_dataclass
 from yahoo_oauth import OAuth2
 import yahoo_fantasy_api as yfa
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from ..utils.json_io import orjson, load_json_file
+
+try:
+    import fcntl  # POSIX only: serializes OAuth token refreshes across processes
+except ImportError:
+    fcntl = None
 
 # Load environment variables
 load_dotenv()
@@ -132,12 +142,122 @@ class ExtractedDraftPick:
     extracted_at: datetime = datetime.now()
 
 
+@dataclass
+class ExtractionStats:
+    """Running record counts per table, updated as each league's records are collected"""
+    leagues: int = 0
+    teams: int = 0
+    rosters: int = 0
+    matchups: int = 0
+    transactions: int = 0
+    draft_picks: int = 0
+    statistics: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    def inc(self, table: str, n: int = 1):
+        """Add n records to a table's count (safe to call from worker threads)"""
+        with self._lock:
+            setattr(self, table, getattr(self, table) + n)
+    
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counts as {table: records}"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith('_')}
+
+# Write buffer for streamed extraction files, so records reach disk in large chunks
+JSON_WRITE_BUFFER_SIZE = 1 << 20
+
+# HTTP statuses Yahoo answers with when throttling (999 is its "request denied") or failing server-side
+THROTTLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504, 999})
+
+def _str_default(value: Any) -> Any:
+    """json default hook that writes dataclass records as objects and anything else via str()"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return vars(value)
+    return str(value)
+
+def _isoformat_default(value: Any) -> Any:
+    """json default hook that writes datetimes as ISO 8601, like orjson does natively"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return _str_default(value)
+
+def dumps_record(record: Any, iso_datetimes: bool = False) -> str:
+    """Serialize one record, matching json.dumps(default=str) output for datetimes
+
+    With iso_datetimes=True datetimes are written as ISO 8601 strings instead.
+    Dataclass records are serialized directly, without a __dict__ copy first.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not iso_datetimes:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(record, default=str, option=option).decode()
+    return json.dumps(record, default=_isoformat_default if iso_datetimes else _str_default)
+
+def dump_records_json(data: Dict[str, List[Any]], f, iso_datetimes: bool = False) -> Dict[str, int]:
+    """Write {table: [records]} as valid JSON with one record per line
+
+    Readers can still json.load the file, while line-oriented tools can scan
+    records without materializing the whole document. Returns the number of
+    records written per table, counted as they are streamed out.
+    """
+    record_counts = {}
+    f.write('{')
+    for i, (table, records) in enumerate(data.items()):
+        f.write(',\n' if i else '\n')
+        f.write(f'{json.dumps(table)}: [')
+        count = 0
+        for record in records:
+            f.write((',\n' if count else '\n') + dumps_record(record, iso_datetimes))
+            count += 1
+        f.write('\n]' if count else ']')
+        record_counts[table] = count
+    f.write('\n}\n')
+    return record_counts
+
+
+# OAuth2 sessions are shared by every extractor in the process, keyed by token file
+_oauth_sessions = {}
+_oauth_sessions_lock = threading.Lock()
+
+def get_oauth_session(token_file: str) -> OAuth2:
+    """Return the process-wide OAuth2 session for a token file, refreshing its token only when expired"""
+    with _oauth_sessions_lock:
+        oauth = _oauth_sessions.get(token_file)
+        if oauth is None:
+            oauth = OAuth2(None, None, from_file=token_file)
+        if not oauth.token_is_valid():
+            oauth = _refresh_oauth_session(oauth, token_file)
+        _oauth_sessions[token_file] = oauth
+        return oauth
+
+def _refresh_oauth_session(oauth: OAuth2, token_file: str) -> OAuth2:
+    """Refresh an expired token while holding an exclusive lock on the token file
+
+    The file is re-read under the lock first, so when scripts run back to back
+    (or concurrently) only the first one refreshes and the rest reuse its token.
+    """
+    with open(token_file, 'r') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            latest = OAuth2(None, None, from_file=token_file)
+            if latest.token_is_valid():
+                logger.info("🔑 Reusing token refreshed by another process")
+                return latest
+            logger.info("🔑 Token invalid, refreshing...")
+            oauth.refresh_access_token()  # yahoo_oauth writes the new token back to token_file
+            return oauth
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 class YahooFantasyExtractor:
     """Comprehensive Yahoo Fantasy data extractor with rate limiting"""
     
     def __init__(self, resume_from_league=None):
         self.oauth = None
+        self.oauth_file = None
         self.game = None
         self.resume_from_league = resume_from_league
         self.request_count = 0
@@ -151,6 +271,34 @@ class YahooFantasyExtractor:
         self.MAX_REQUESTS_PER_HOUR = 20000  # Yahoo's actual hourly limit
         self.MAX_REQUESTS_PER_DAY = 100000  # Yahoo's actual daily limit
         self.MIN_REQUEST_INTERVAL = 0.6     # Minimum 0.6 seconds between requests
+        self.MAX_ENDPOINT_WORKERS = 5       # Per-league endpoints fetched concurrently
+        self.HTTP_POOL_MAXSIZE = 16         # Keep-alive connections to Yahoo shared by all worker threads
+        self.tuned_session = None
+        
+        # AIMD backoff on top of the usage-based interval: doubled when Yahoo throttles us,
+        # walked back down while requests succeed within the target latency
+        self.throttle_interval = 0.0
+        self.MAX_THROTTLE_INTERVAL = 30.0
+        self.THROTTLE_DECREASE_STEP = 0.05
+        self.TARGET_REQUEST_LATENCY = 0.8
+        
+        # Transient failures (throttling, 5xx, dropped connections) are retried with jittered exponential backoff
+        self.MAX_REQUEST_RETRIES = 4
+        self.MAX_RETRY_DELAY = 30.0
+        
+        # Settings of finished seasons never change, so they are cached on disk across runs
+        self.SETTINGS_CACHE_FILE = os.getenv('YAHOO_SETTINGS_CACHE', 'data/cache/league_settings.json')
+        # Likewise for per-league responses (matchups, drafts) of finished seasons
+        self.LEAGUE_CACHE_DIR = os.getenv('YAHOO_LEAGUE_CACHE_DIR', 'data/cache/leagues')
+        # Completed leagues are appended here (one JSON line each) so an interrupted run can resume.
+        # The first line records the run's options and start time; a checkpoint from a run with
+        # other options, or older than CHECKPOINT_MAX_AGE seconds, is discarded instead of resumed
+        self.CHECKPOINT_FILE = os.getenv('YAHOO_EXTRACTION_CHECKPOINT', 'data/cache/extraction_checkpoint.jsonl')
+        self.CHECKPOINT_MAX_AGE = float(os.getenv('YAHOO_CHECKPOINT_MAX_AGE_HOURS', '24')) * 3600
+        self.checkpoint_params = None
+        
+        # Guards the request counters and slot scheduling when extractors run in threads
+        self.request_lock = threading.Lock()
         
         self.extracted_data = {
             'leagues': [],
@@ -161,6 +309,164 @@ class YahooFantasyExtractor:
             'draft_picks': [],
             'statistics': []
         }
+        self.stats = ExtractionStats()
+        
+        # Per-league caches - league objects, league.teams() and league.settings() are reused across extractors
+        self.league_cache = {}
+        self.league_teams_cache = {}
+        self.league_settings_cache = {}
+        
+        # Requests currently in flight, keyed by (cache, league_id); concurrent callers share one Future
+        self.inflight_requests = {}
+        self.inflight_lock = threading.Lock()
+    
+    def _get_league(self, league_id: str):
+        """Build the yfa League object once per league and reuse it"""
+        league = self.league_cache.get(league_id)
+        if league is None:
+            league = self.league_cache[league_id] = self.game.to_league(league_id)
+        return league
+    
+    def _coalesced_request(self, cache: Dict[str, Any], league_id: str, func):
+        """Fetch a cached per-league value once, even when several workers miss the cache together
+
+        The first caller issues the request; callers arriving while it is in
+        flight wait on the same Future instead of sending a duplicate.
+        """
+        inflight_key = (id(cache), league_id)
+        with self.inflight_lock:
+            if league_id in cache:
+                return cache[league_id]
+            future = self.inflight_requests.get(inflight_key)
+            is_owner = future is None
+            if is_owner:
+                future = self.inflight_requests[inflight_key] = Future()
+        
+        if not is_owner:
+            return future.result()
+        
+        try:
+            result = cache[league_id] = self._rate_limited_request(func)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.inflight_lock:
+                del self.inflight_requests[inflight_key]
+    
+    def _get_league_teams(self, league, league_id: str) -> Dict[str, Any]:
+        """Get league.teams() once per league and reuse it across extractors"""
+        return self._coalesced_request(self.league_teams_cache, league_id, lambda: league.teams())
+    
+    def _get_league_settings(self, league, league_id: str) -> Dict[str, Any]:
+        """Get league.settings() once per league and reuse it across extractors"""
+        return self._coalesced_request(self.league_settings_cache, league_id, lambda: league.settings())
+    
+    def _load_settings_cache(self) -> Dict[str, Any]:
+        """Load cached settings for finished leagues from disk"""
+        if not os.path.exists(self.SETTINGS_CACHE_FILE):
+            return {}
+        try:
+            return load_json_file(self.SETTINGS_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable league settings cache: {e}")
+            return {}
+    
+    def _save_settings_cache(self, settings_cache: Dict[str, Any]):
+        """Persist cached settings for finished leagues to disk"""
+        try:
+            os.makedirs(os.path.dirname(self.SETTINGS_CACHE_FILE) or '.', exist_ok=True)
+            with open(self.SETTINGS_CACHE_FILE, 'w') as f:
+                f.write(dumps_record(settings_cache))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save league settings cache: {e}")
+    
+    def _cached_league_call(self, league, league_id: str, key: str, func):
+        """Serve a finished league's API response from disk, fetching and persisting it on a miss"""
+        if not self._is_finished_season(self._get_league_settings(league, league_id)):
+            return self._rate_limited_request(func)
+        
+        cache_file = os.path.join(self.LEAGUE_CACHE_DIR, league_id, f"{key}.json")
+        if os.path.exists(cache_file):
+            try:
+                return load_json_file(cache_file)
+            except Exception as e:
+                logger.warning(f"⚠️ Ignoring unreadable cache file {cache_file}: {e}")
+        
+        result = self._rate_limited_request(func)
+        if result:
+            try:
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                with open(cache_file, 'w') as f:
+                    f.write(dumps_record(result))
+            except Exception as e:
+                logger.warning(f"⚠️ Could not save cache file {cache_file}: {e}")
+        return result
+    
+    def _checkpoint_header_matches(self, header_line: bytes, run_params: Dict[str, Any]) -> bool:
+        """True when a checkpoint was written by a recent run with the same options"""
+        try:
+            header = orjson.loads(header_line) if orjson is not None else json.loads(header_line)
+        except ValueError:
+            return False
+        if not isinstance(header, dict) or header.get('run') != run_params:
+            return False
+        return 0 <= time.time() - header.get('created_at', 0) <= self.CHECKPOINT_MAX_AGE
+    
+    def _load_checkpoint(self, run_params: Dict[str, Any]) -> set:
+        """Restore leagues completed by an interrupted run with the same options and return their IDs"""
+        self.checkpoint_params = run_params
+        completed = set()
+        if not os.path.exists(self.CHECKPOINT_FILE):
+            return completed
+        try:
+            with open(self.CHECKPOINT_FILE, 'rb') as f:
+                header_line = f.readline()
+            if not self._checkpoint_header_matches(header_line, run_params):
+                # e.g. left behind by a crashed --drafts-only run, whose leagues lack every other table
+                logger.warning(f"⚠️ Discarding extraction checkpoint {self.CHECKPOINT_FILE}: "
+                               f"written by a run with different options or too long ago")
+                os.remove(self.CHECKPOINT_FILE)
+                return completed
+            
+            with open(self.CHECKPOINT_FILE, 'rb') as f:
+                next(f, None)  # Header
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = orjson.loads(line) if orjson is not None else json.loads(line)
+                    for table, records in entry['tables'].items():
+                        self.extracted_data[table].extend(records)
+                        self.stats.inc(table, len(records))
+                    completed.add(entry['league_id'])
+        except Exception as e:
+            # A torn final line only means that league is extracted again
+            logger.warning(f"⚠️ Stopped reading extraction checkpoint early: {e}")
+        if completed:
+            logger.info(f"♻️ Resuming extraction: {len(completed)} leagues restored from {self.CHECKPOINT_FILE}")
+        return completed
+    
+    def _append_checkpoint(self, league_id: str, league_records: Dict[str, List[Any]]):
+        """Persist one completed league's records to the checkpoint file"""
+        try:
+            os.makedirs(os.path.dirname(self.CHECKPOINT_FILE) or '.', exist_ok=True)
+            with open(self.CHECKPOINT_FILE, 'a') as f:
+                if f.tell() == 0:
+                    # New checkpoint - start it with the options a resuming run has to match
+                    f.write(dumps_record({'run': self.checkpoint_params, 'created_at': time.time()}) + '\n')
+                f.write(dumps_record({'league_id': league_id, 'tables': league_records}, iso_datetimes=True) + '\n')
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write extraction checkpoint for {league_id}: {e}")
+    
+    @staticmethod
+    def _is_finished_season(settings: Dict[str, Any]) -> bool:
+        """True when a league's settings can no longer change (season is over)"""
+        if str(settings.get('is_finished', '0')) == '1':
+            return True
+        season = str(settings.get('season', ''))
+        return season.isdigit() and int(season) < datetime.now().year - 1
     
     def _check_rate_limits(self):
         """Check if we're approaching rate limits and pause if necessary"""
@@ -251,40 +557,116 @@ class YahooFantasyExtractor:
             }
     
     def _rate_limited_request(self, func, *args, **kwargs):
-        """Execute a function with adaptive rate limiting"""
-        # Check rate limits before making request
-        self._check_rate_limits()
-        
-        # Get current adaptive settings
-        settings = self._get_adaptive_settings()
-        min_interval = settings['min_request_interval']
+        """Execute a function with adaptive rate limiting, retrying transient failures"""
+        for attempt in range(self.MAX_REQUEST_RETRIES + 1):
+            try:
+                return self._send_rate_limited_request(func, *args, **kwargs)
+            except Exception as e:
+                if attempt == self.MAX_REQUEST_RETRIES or not self._is_transient_error(e):
+                    raise
+                delay = min(self.MAX_RETRY_DELAY, 0.5 * 2 ** attempt) + random.uniform(0, 0.3)
+                logger.warning(f"🔁 Transient API error, retry {attempt + 1}/{self.MAX_REQUEST_RETRIES} in {delay:.1f}s: {e}")
+                time.sleep(delay)
+    
+    def _send_rate_limited_request(self, func, *args, **kwargs):
+        """Execute a single attempt of a function under the adaptive rate limiter"""
+        # Reserve the next request slot under the lock so concurrent callers keep the spacing
+        with self.request_lock:
+            self._tune_http_session()
+            
+            # Check rate limits before making request
+            self._check_rate_limits()
+            
+            # Get current adaptive settings
+            settings = self._get_adaptive_settings()
+            min_interval = settings['min_request_interval'] + self.throttle_interval
+            
+            # Ensure minimum time between request starts (adaptive)
+            current_time = time.time()
+            request_slot = max(current_time, self.last_request_time + min_interval)
+            self.last_request_time = request_slot
+            
+            # Failed requests still count toward the rate limit
+            self.hourly_request_count += 1
+            self.daily_request_count += 1
+            hourly_count = self.hourly_request_count
         
-        # Ensure minimum time between requests (adaptive)
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            time.sleep(sleep_time)
+        if request_slot > current_time:
+            time.sleep(request_slot - current_time)
         
-        # Make the request
+        # Make the request outside the lock so its latency overlaps with other callers
         try:
+            started = time.perf_counter()
             result = func(*args, **kwargs)
-            self.hourly_request_count += 1
-            self.daily_request_count += 1
-            self.last_request_time = time.time()
+            self._on_request_success(time.perf_counter() - started)
             
             # Log progress more frequently for better monitoring
-            if self.hourly_request_count % 25 == 0:
+            if hourly_count % 25 == 0:
                 logger.info(f"📊 API Progress - Hour: {self.hourly_request_count}/{self.MAX_REQUESTS_PER_HOUR}, Day: {self.daily_request_count}/{self.MAX_REQUESTS_PER_DAY}")
             
             return result
         except Exception as e:
+            self._on_request_error(e)
             logger.error(f"Rate limited request failed: {e}")
-            # Still count failed requests toward rate limit
-            self.hourly_request_count += 1
-            self.daily_request_count += 1
-            self.last_request_time = time.time()
             raise
+    
+    def _tune_http_session(self):
+        """Size the OAuth session's connection pool for our worker threads (re-applied if the session is replaced)"""
+        session = getattr(self.oauth, 'session', None)
+        if session is None or session is self.tuned_session:
+            return
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.HTTP_POOL_MAXSIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        self.tuned_session = session
+    
+    def _on_request_success(self, elapsed: float):
+        """Additively relax the throttle backoff after a fast successful request"""
+        if self.throttle_interval and elapsed < self.TARGET_REQUEST_LATENCY:
+            with self.request_lock:
+                self.throttle_interval = max(0.0, self.throttle_interval - self.THROTTLE_DECREASE_STEP)
+    
+    @staticmethod
+    def _is_throttle_error(error: Exception) -> bool:
+        """Whether Yahoo rejected the request for throttling or a server-side failure"""
+        # Decided by the HTTP status where there is one. yfa raises a bare RuntimeError with the
+        # response body, so that falls back to Yahoo's throttling phrases - never to bare numbers
+        # like '429', which also turn up in league keys, player IDs and timestamps
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+        if status_code is not None:
+            return status_code in THROTTLE_STATUS_CODES
+        message = str(error).lower()
+        return any(phrase in message for phrase in ('rate limit', 'too many requests', 'request denied'))
+    
+    def _is_transient_error(self, error: Exception) -> bool:
+        """Whether a failed request is worth retrying (throttling, 5xx, dropped connections)"""
+        # Only failures known from the transport or the HTTP status are retried - an error body
+        # that merely mentions throttling still backs off the rate limiter, but isn't retried
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        return getattr(getattr(error, 'response', None), 'status_code', None) in THROTTLE_STATUS_CODES
+    
+    def _on_request_error(self, error: Exception):
+        """Multiplicatively back off when Yahoo throttles or fails, honoring Retry-After"""
+        if not self._is_throttle_error(error):
+            return
+        
+        response = getattr(error, 'response', None)
+        retry_after = None
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            retry_after = float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            pass
+        
+        with self.request_lock:
+            self.throttle_interval = min(self.MAX_THROTTLE_INTERVAL, max(0.5, self.throttle_interval * 2))
+            if retry_after:
+                # Hold every queued request until Yahoo's requested retry time
+                self.last_request_time = max(self.last_request_time, time.time() + retry_after)
+            throttle_interval = self.throttle_interval
+        logger.warning(f"🐢 Yahoo throttling detected - backing off to +{throttle_interval:.2f}s between requests"
+                       + (f" (Retry-After {retry_after:.0f}s)" if retry_after else ""))
         
     def authenticate(self) -> bool:
         """Authenticate with Yahoo Fantasy API"""
@@ -300,12 +682,9 @@ class YahooFantasyExtractor:
                     break
             
             if oauth_file:
-                # Use existing oauth file
-                self.oauth = OAuth2(None, None, from_file=oauth_file)
-                
-                if not self.oauth.token_is_valid():
-                    logger.info("🔑 Token invalid, refreshing...")
-                    self.oauth.refresh_access_token()
+                # Use existing oauth file (shared across extractors, refreshed only when expired)
+                self.oauth_file = oauth_file
+                self.oauth = get_oauth_session(oauth_file)
             else:
                 # No oauth file found - create one from environment variables
                 logger.info("🔑 No OAuth file found, creating from environment variables...")
@@ -331,7 +710,11 @@ class YahooFantasyExtractor:
                 logger.info(f"✅ Created {oauth_file} with credentials from environment")
                 
                 # Initialize OAuth with new file
-                self.oauth = OAuth2(None, None, from_file=oauth_file)
+                self.oauth_file = oauth_file
+                self.oauth = get_oauth_session(oauth_file)
+            
+            # Reuse keep-alive connections across all worker threads
+            self._tune_http_session()
             
             # Create Game object for NFL
             self.game = yfa.Game(self.oauth, 'nfl')
@@ -347,6 +730,18 @@ class YahooFantasyExtractor:
                 logger.error("💡 Tip: Make sure YAHOO_CLIENT_KEY and YAHOO_CLIENT_SECRET are set in your .env file")
             return False
     
+    def refresh_token_if_expired(self):
+        """Refresh an expired token through the shared session, under the token file lock"""
+        if self.oauth.token_is_valid():
+            return
+        oauth = get_oauth_session(self.oauth_file)
+        if oauth is not self.oauth:
+            # Another process refreshed first - move the game and future league objects to its session
+            self.oauth = oauth
+            self.game = yfa.Game(oauth, 'nfl')
+            self.league_cache.clear()
+            self._tune_http_session()
+    
     def get_all_leagues(self) -> List[Dict[str, Any]]:
         """Get all user's fantasy leagues using BULK API optimization"""
         try:
@@ -368,6 +763,10 @@ class YahooFantasyExtractor:
                 
             logger.info(f"💰 API SAVINGS: Found {len(all_league_ids)} total leagues (saved ~22 API calls!)")
             
+            # Settings for finished seasons are served from the on-disk cache
+            settings_cache = self._load_settings_cache()
+            cached_count = len(settings_cache)
+            
             # Process leagues in bulk batches for efficiency
             all_leagues = []
             batch_size = 10  # Process settings for 10 leagues at a time
@@ -378,8 +777,14 @@ class YahooFantasyExtractor:
                 
                 for league_id in batch_league_ids:
                     try:
-                        league = self.game.to_league(league_id)
-                        settings = self._rate_limited_request(lambda: league.settings())
+                        league = self._get_league(league_id)
+                        settings = settings_cache.get(league_id)
+                        if settings is None:
+                            settings = self._get_league_settings(league, league_id)
+                            if self._is_finished_season(settings):
+                                settings_cache[league_id] = settings
+                        else:
+                            self.league_settings_cache[league_id] = settings
                         
                         # Only include non-public leagues with game data
                         league_name = settings.get('name', '')
@@ -387,12 +792,12 @@ class YahooFantasyExtractor:
                         
                         # Skip predraft leagues (they have no game data)
                         if draft_status == 'predraft':
-                            logger.debug(f"  Skipping predraft league: {league_name}")
+                            logger.debug("  Skipping predraft league: %s", league_name)
                             continue
                         
                         # Skip public leagues
                         if league_name.startswith('Yahoo Public'):
-                            logger.debug(f"  Skipping public league: {league_name}")
+                            logger.debug("  Skipping public league: %s", league_name)
                             continue
                             
                         # Extract game code from league ID or settings
@@ -429,6 +834,9 @@ class YahooFantasyExtractor:
                 if i + batch_size < len(all_league_ids):
                     time.sleep(1)
             
+            if len(settings_cache) != cached_count:
+                self._save_settings_cache(settings_cache)
+            
             logger.info(f"📋 BULK SUCCESS: Found {len(all_leagues)} leagues with {len(all_league_ids) - len(all_leagues)} filtered out")
             logger.info(f"💡 Total API calls saved: ~{len(all_league_ids)} (used bulk discovery instead of year-by-year)")
             return all_leagues
@@ -461,14 +869,14 @@ class YahooFantasyExtractor:
         """Extract all team data for a specific league"""
         try:
             # Get league object
-            league = self.game.to_league(league_id)
+            league = self._get_league(league_id)
             teams = []
             
             # Get standings (this includes team information with records)
             standings = league.standings()
             
             # Get teams (this includes manager and metadata)
-            teams_data = league.teams() if hasattr(league, 'teams') else {}
+            teams_data = self._get_league_teams(league, league_id) if hasattr(league, 'teams') else {}
             
             # Create a mapping of team_id to team metadata
             teams_metadata = {}
@@ -491,23 +899,15 @@ class YahooFantasyExtractor:
                     # Get outcome totals for wins/losses
                     outcome_totals = team_data.get('outcome_totals', {})
                     
-                    # Convert string values to appropriate types
-                    wins = 0
-                    losses = 0
-                    ties = 0
+                    # Convert string values to appropriate types (isdigit guard makes int() safe)
+                    wins_val = outcome_totals.get('wins', 0)
+                    wins = int(wins_val) if str(wins_val).isdigit() else 0
                     
-                    try:
-                        wins_val = outcome_totals.get('wins', 0)
-                        wins = int(wins_val) if str(wins_val).isdigit() else 0
-                        
-                        losses_val = outcome_totals.get('losses', 0)
-                        losses = int(losses_val) if str(losses_val).isdigit() else 0
-                        
-                        ties_val = outcome_totals.get('ties', 0)
-                        ties = int(ties_val) if str(ties_val).isdigit() else 0
-                    except (ValueError, TypeError):
-                        # Keep defaults if conversion fails
-                        pass
+                    losses_val = outcome_totals.get('losses', 0)
+                    losses = int(losses_val) if str(losses_val).isdigit() else 0
+                    
+                    ties_val = outcome_totals.get('ties', 0)
+                    ties = int(ties_val) if str(ties_val).isdigit() else 0
                     
                     # Get points
                     points_for = 0.0
@@ -533,12 +933,9 @@ class YahooFantasyExtractor:
                     
                     # Get other metadata
                     playoff_seed = None
-                    try:
-                        seed_val = team_data.get('playoff_seed')
-                        if seed_val and str(seed_val).isdigit():
-                            playoff_seed = int(seed_val)
-                    except (ValueError, TypeError):
-                        pass
+                    seed_val = team_data.get('playoff_seed')
+                    if seed_val and str(seed_val).isdigit():
+                        playoff_seed = int(seed_val)
                     
                     # Get FAAB and waiver priority from metadata
                     faab_balance = None
@@ -584,7 +981,7 @@ class YahooFantasyExtractor:
                     ))
                     
                 except Exception as e:
-                    logger.warning(f"Error processing team {team_id}: {e}")
+                    logger.warning("Error processing team %s: %s", team_id, e)
                     continue
             
             logger.info(f"  📊 Found {len(teams)} teams in league {league_id}")
@@ -610,18 +1007,14 @@ class YahooFantasyExtractor:
         try:
             logger.info(f"🚀 BULK ROSTERS EXTRACTION: Getting roster data for league {league_id}...")
             
-            # Get league object (1 API call)
-            league = self._rate_limited_request(
-                lambda: self.game.to_league(league_id)
-            )
+            # Get league object (cached per league)
+            league = self._get_league(league_id)
             
             if not league:
                 return rosters
             
-            # Get league settings (1 API call)
-            settings = self._rate_limited_request(
-                lambda: league.settings()
-            )
+            # Get league settings (cached per league)
+            settings = self._get_league_settings(league, league_id)
             
             # Determine sport and optimize week selection
             sport_code = settings.get('game_code', 'unknown').lower()
@@ -634,10 +1027,8 @@ class YahooFantasyExtractor:
             else:
                 logger.info(f"📋 ROSTER WEEKS: Extracting weeks {weeks_to_extract}")
             
-            # BULK OPTIMIZATION: Get teams once (1 API call)
-            teams = self._rate_limited_request(
-                lambda: league.teams()
-            )
+            # BULK OPTIMIZATION: Get teams once (reuses teams extraction result when cached)
+            teams = self._get_league_teams(league, league_id)
             
             team_count = len(teams)
             week_count = len(weeks_to_extract)
@@ -645,58 +1036,46 @@ class YahooFantasyExtractor:
             logger.info(f"📦 BULK ROSTERS: {team_count} teams × {week_count} weeks")
             logger.info(f"⚡ OPTIMIZATION: Attempting bulk roster extraction...")
             
-            # BULK EXTRACTION: Get all rosters for all weeks
-            for week in weeks_to_extract:
-                logger.info(f"    📋 BULK: Week {week} rosters ({team_count} teams)...")
-                
-                # Skip bulk method - Yahoo API doesn't support league.rosters()
-                # Go directly to individual team calls
-                logger.info(f"    📋 Using individual team roster calls for week {week}...")
+            # Team objects are local yfa wrappers (no API call), so build them once rather than per week
+            team_objs = {}
+            for team_key, team_data in teams.items():
+                team_id = team_data.get('team_key', team_key)
                 
-                # Individual team roster calls using correct Yahoo API syntax
-                for team_key, team_data in teams.items():
-                    try:
-                        team_id = team_data.get('team_key', team_key)
-                        
-                        # Construct the full team key for API call
-                        full_team_key = f"{league_id}.t.{team_id.split('.')[-1]}" if '.' not in team_id else team_id
-                        
-                        # Get team roster for specific week using Yahoo Fantasy API
-                        # Format: /team/{team_key}/roster;week={week}
-                        team_obj = self._rate_limited_request(
-                            lambda: league.to_team(full_team_key)
-                        )
-                        
-                        if not team_obj:
-                            logger.debug(f"Could not get team object for {full_team_key}")
-                            continue
-                        
-                        # Get roster for this specific week
-                        # Yahoo API expects roster as a sub-resource with week parameter
-                        roster_data = self._rate_limited_request(
-                            lambda: team_obj.roster(week=week)
-                        )
-                        
-                        if not roster_data:
-                            logger.debug(f"No roster data for team {full_team_key} week {week}")
-                            continue
-                        
-                        # Process each player in the roster
-                        players_count = 0
-                        if hasattr(roster_data, '__iter__'):
-                            for player_data in roster_data:
-                                roster_entry = self._extract_roster_player_data(
-                                    player_data, league_id, team_id, week
-                                )
-                                if roster_entry:
-                                    rosters.append(roster_entry)
-                                    players_count += 1
-                        
-                        logger.debug(f"    ✅ Team {team_id} week {week}: {players_count} players")
-                                
-                    except Exception as e:
-                        logger.warning(f"Error getting roster for team {team_key} week {week}: {e}")
+                # Construct the full team key for API call
+                full_team_key = f"{league_id}.t.{team_id.split('.')[-1]}" if '.' not in team_id else team_id
+                team_objs[team_id] = league.to_team(full_team_key)
+            
+            def fetch_roster(team_week):
+                team_id, week = team_week
+                try:
+                    # Get team roster for specific week using Yahoo Fantasy API
+                    # Format: /team/{team_key}/roster;week={week}
+                    return self._rate_limited_request(lambda: team_objs[team_id].roster(week=week))
+                except Exception as e:
+                    logger.warning("Error getting roster for team %s week %s: %s", team_id, week, e)
+                    return None
+            
+            # BULK EXTRACTION: every (team, week) roster is independent, so fan them out across the
+            # worker pool (the rate limiter keeps the spacing) and process results in week/team order
+            team_weeks = [(team_id, week) for week in weeks_to_extract for team_id in team_objs]
+            with ThreadPoolExecutor(max_workers=self.MAX_ENDPOINT_WORKERS) as executor:
+                for (team_id, week), roster_data in zip(team_weeks, executor.map(fetch_roster, team_weeks)):
+                    if not roster_data:
+                        logger.debug("No roster data for team %s week %s", team_id, week)
                         continue
+                    
+                    # Process each player in the roster
+                    players_count = 0
+                    if hasattr(roster_data, '__iter__'):
+                        for player_data in roster_data:
+                            roster_entry = self._extract_roster_player_data(
+                                player_data, league_id, team_id, week
+                            )
+                            if roster_entry:
+                                rosters.append(roster_entry)
+                                players_count += 1
+                    
+                    logger.debug("    ✅ Team %s week %s: %s players", team_id, week, players_count)
             
             logger.info(f"  ✅ BULK ROSTERS: Found {len(rosters)} roster entries in league {league_id}")
             return rosters
@@ -766,25 +1145,24 @@ class YahooFantasyExtractor:
             logger.warning(f"Player data structure: {player_data}")
             return None
     
-    def extract_matchups_for_league(self, league_id: str) -> List[Dict[str, Any]]:
-        """BULK OPTIMIZED: Extract matchup data efficiently with sport-specific week logic"""
+    def extract_matchups_for_league(self, league_id: str, weeks_to_extract: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """BULK OPTIMIZED: Extract matchup data efficiently with sport-specific week logic
+
+        When weeks_to_extract is given, only those weeks (within the league's range) are requested.
+        """
         matchups = []
         
         try:
             logger.info(f"🚀 BULK MATCHUPS EXTRACTION: Getting matchup data for league {league_id}...")
             
             # Get league object  
-            league = self._rate_limited_request(
-                lambda: self.game.to_league(league_id)
-            )
+            league = self._get_league(league_id)
             
             if not league:
                 return matchups
             
-            # Get league settings to determine sport and weeks
-            settings = self._rate_limited_request(
-                lambda: league.settings()
-            )
+            # Get league settings to determine sport and weeks (cached per league)
+            settings = self._get_league_settings(league, league_id)
             
             # Determine sport from league ID prefix or game_code
             sport_code = settings.get('game_code', 'unknown').lower()
@@ -821,13 +1199,22 @@ class YahooFantasyExtractor:
             
             logger.info(f"📦 BULK: Getting matchups for weeks {start_week} to {end_week}")
             
-            # Get matchups for completed weeks only
-            for week in range(start_week, end_week + 1):
+            def fetch_week(week):
                 try:
-                    week_matchups = self._rate_limited_request(
-                        lambda: league.matchups(week)
+                    return self._cached_league_call(
+                        league, league_id, f"matchups_week_{week}", lambda: league.matchups(week)
                     )
-                    
+                except Exception as e:
+                    logger.warning("Failed to get matchups for week %s: %s", week, e)
+                    return None
+            
+            # Get matchups for completed weeks only - weeks are independent, so fetch them concurrently
+            weeks = range(start_week, end_week + 1)
+            if weeks_to_extract is not None:
+                requested_weeks = set(weeks_to_extract)
+                weeks = [week for week in weeks if week in requested_weeks]
+            with ThreadPoolExecutor(max_workers=self.MAX_ENDPOINT_WORKERS) as executor:
+                for week, week_matchups in zip(weeks, executor.map(fetch_week, weeks)):
                     if week_matchups:
                         matchups.append({
                             'league_id': league_id,
@@ -836,10 +1223,6 @@ class YahooFantasyExtractor:
                             'matchups': week_matchups,
                             'extracted_at': datetime.now().isoformat()
                         })
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to get matchups for week {week}: {e}")
-                    continue
             
             logger.info(f"✅ BULK MATCHUPS SUCCESS: Extracted {len(matchups)} week records for {sport_code}")
             return matchups
@@ -854,14 +1237,26 @@ class YahooFantasyExtractor:
         
         try:
             # Get league object
-            league = self.game.to_league(league_id)
+            league = self._get_league(league_id)
             
             # Get different types of transactions using the correct format
             transaction_types = ['add,drop', 'trade']
             
+            # Fetch each type with its own limit, concurrently. A combined 'add,drop,trade'
+            # request shares one count across every type (yfa exposes no paging offset),
+            # so busy add/drop activity could push a league's trades out of the result.
+            with ThreadPoolExecutor(max_workers=len(transaction_types)) as executor:
+                futures = {
+                    trans_type: executor.submit(
+                        self._rate_limited_request,
+                        lambda trans_type=trans_type: league.transactions(trans_type, 500)  # Increased limit for complete data
+                    )
+                    for trans_type in transaction_types
+                }
+            
             for trans_type in transaction_types:
                 try:
-                    league_transactions = league.transactions(trans_type, 500)  # Increased limit for complete data
+                    league_transactions = futures[trans_type].result()
                     
                     for trans_data in league_transactions:
                         try:
@@ -943,11 +1338,11 @@ class YahooFantasyExtractor:
                                             ))
                                             
                                     except Exception as e:
-                                        logger.warning(f"Error processing player {key} in transaction {transaction_id}: {e}")
+                                        logger.warning("Error processing player %s in transaction %s: %s", key, transaction_id, e)
                                         continue
                                     
                         except Exception as e:
-                            logger.warning(f"Error processing transaction: {e}")
+                            logger.warning("Error processing transaction: %s", e)
                             continue
                             
                 except Exception as e:
@@ -966,14 +1361,16 @@ class YahooFantasyExtractor:
         
         try:
             # Get the league object
-            league = self.game.to_league(league_id)
+            league = self._get_league(league_id)
             
-            # Get league settings to check if it's auction
-            settings = league.settings()
+            # Get league settings to check if it's auction (cached per league)
+            settings = self._get_league_settings(league, league_id)
             is_auction_draft = settings.get('is_auction_draft', '0') == '1'
             
             # Get draft results
-            draft_results = league.draft_results()
+            draft_results = self._cached_league_call(
+                league, league_id, 'draft_results', lambda: league.draft_results()
+            )
             
             if not draft_results:
                 logger.info(f"  🎯 No draft results found for league {league_id}")
@@ -1051,7 +1448,7 @@ class YahooFantasyExtractor:
                     draft_picks.append(draft_pick)
                     
                 except Exception as e:
-                    logger.warning(f"Error processing draft pick: {e}")
+                    logger.warning("Error processing draft pick: %s", e)
                     continue
             
             logger.info(f"  🎯 Found {len(draft_picks)} draft picks in league {league_id}")
@@ -1128,6 +1525,18 @@ class YahooFantasyExtractor:
         current_batch_size = initial_batch_size
         current_batch_delay = initial_batch_delay
         
+        # Skip leagues an interrupted run with the same options already finished (their records are restored)
+        completed_leagues = self._load_checkpoint({
+            'sport_filter': sport_filter, 'private_only': private_only,
+            'extract_leagues': extract_leagues, 'extract_teams': extract_teams,
+            'extract_rosters': extract_rosters, 'extract_matchups': extract_matchups,
+            'extract_transactions': extract_transactions, 'extract_drafts': extract_drafts,
+            'roster_weeks': roster_weeks,
+        })
+        if completed_leagues:
+            leagues_data = [league for league in leagues_data if league['league_id'] not in completed_leagues]
+            total_leagues = len(leagues_data)
+        
         total_batches = (total_leagues + current_batch_size - 1) // current_batch_size
         
         for batch_num in range(total_batches):
@@ -1151,39 +1560,62 @@ class YahooFantasyExtractor:
                 try:
                     logger.info(f"  🔄 [{i+1}/{len(batch_leagues)}] Processing {league_name} ({league_id})")
                     
-                    # Extract league data (if enabled)
+                    league_records = {}
+                    
+                    # Extract league data (if enabled) - built from league_info, no API call
                     if extract_leagues:
-                        league_data = self.extract_league_data(league_info)
-                        self.extracted_data['leagues'].append(asdict(league_data))
+                        league_records['leagues'] = [vars(self.extract_league_data(league_info))]
                     
-                    # Extract teams data (if enabled)
-                    if extract_teams:
-                        teams_data = self.extract_teams_for_league(league_id)
-                        self.extracted_data['teams'].extend([asdict(team) for team in teams_data])
+                    # Prime the shared league caches so concurrent extractors don't race to fill them
+                    league = self._get_league(league_id)
+                    if extract_teams or extract_rosters:
+                        self._get_league_teams(league, league_id)
+                    if extract_rosters or extract_matchups or extract_drafts:
+                        self._get_league_settings(league, league_id)
                     
-                    # Extract roster data (if enabled)
-                    if extract_rosters:
-                        logger.info(f"    📋 Extracting roster data...")
-                        rosters_data = self.extract_rosters_for_league(league_id, roster_weeks)
-                        self.extracted_data['rosters'].extend([asdict(roster) for roster in rosters_data])
+                    # The per-league endpoints are independent, so overlap their request latency
+                    with ThreadPoolExecutor(max_workers=self.MAX_ENDPOINT_WORKERS) as executor:
+                        # Extract teams data (if enabled)
+                        if extract_teams:
+                            teams_future = executor.submit(self.extract_teams_for_league, league_id)
+                        
+                        # Extract roster data (if enabled)
+                        if extract_rosters:
+                            logger.info(f"    📋 Extracting roster data...")
+                            rosters_future = executor.submit(self.extract_rosters_for_league, league_id, roster_weeks)
+                        
+                        # Extract matchups data (if enabled)
+                        if extract_matchups:
+                            logger.info(f"    🏆 Extracting matchup data...")
+                            matchups_future = executor.submit(self.extract_matchups_for_league, league_id)
+                        
+                        # Extract transactions data (if enabled)
+                        if extract_transactions:
+                            logger.info(f"    💼 Extracting transaction data...")
+                            transactions_future = executor.submit(self.extract_transactions_for_league, league_id)
+                        
+                        # Extract draft data (if enabled)
+                        if extract_drafts:
+                            logger.info(f"    🎯 Extracting draft data...")
+                            draft_future = executor.submit(self.extract_draft_for_league, league_id)
                     
-                    # Extract matchups data (if enabled)
+                    # Collect results in the original table order. Records are flat, so each
+                    # instance's own __dict__ is stored instead of a recursive asdict() deep copy
+                    if extract_teams:
+                        league_records['teams'] = [vars(team) for team in teams_future.result()]
+                    if extract_rosters:
+                        league_records['rosters'] = [vars(roster) for roster in rosters_future.result()]
                     if extract_matchups:
-                        logger.info(f"    🏆 Extracting matchup data...")
-                        matchups_data = self.extract_matchups_for_league(league_id)
-                        self.extracted_data['matchups'].extend(matchups_data)
-                    
-                    # Extract transactions data (if enabled)
+                        league_records['matchups'] = matchups_future.result()
                     if extract_transactions:
-                        logger.info(f"    💼 Extracting transaction data...")
-                        transactions_data = self.extract_transactions_for_league(league_id)
-                        self.extracted_data['transactions'].extend([asdict(trans) for trans in transactions_data])
-                    
-                    # Extract draft data (if enabled)
+                        league_records['transactions'] = [vars(trans) for trans in transactions_future.result()]
                     if extract_drafts:
-                        logger.info(f"    🎯 Extracting draft data...")
-                        draft_data = self.extract_draft_for_league(league_id)
-                        self.extracted_data['draft_picks'].extend([asdict(pick) for pick in draft_data])
+                        league_records['draft_picks'] = [vars(pick) for pick in draft_future.result()]
+                    
+                    for table, records in league_records.items():
+                        self.extracted_data[table].extend(records)
+                        self.stats.inc(table, len(records))
+                    self._append_checkpoint(league_id, league_records)
                     
                     logger.info(f"    ✅ Completed {league_name}")
                     
@@ -1204,12 +1636,12 @@ class YahooFantasyExtractor:
         # Log final summary
         logger.info("🎉 Selective data extraction completed!")
         logger.info(f"📊 Final Summary:")
-        logger.info(f"  - Leagues: {len(self.extracted_data['leagues'])}")
-        logger.info(f"  - Teams: {len(self.extracted_data['teams'])}")
-        logger.info(f"  - Rosters: {len(self.extracted_data['rosters'])}")
-        logger.info(f"  - Matchups: {len(self.extracted_data['matchups'])}")
-        logger.info(f"  - Transactions: {len(self.extracted_data['transactions'])}")
-        logger.info(f"  - Draft Picks: {len(self.extracted_data['draft_picks'])}")
+        logger.info(f"  - Leagues: {self.stats.leagues}")
+        logger.info(f"  - Teams: {self.stats.teams}")
+        logger.info(f"  - Rosters: {self.stats.rosters}")
+        logger.info(f"  - Matchups: {self.stats.matchups}")
+        logger.info(f"  - Transactions: {self.stats.transactions}")
+        logger.info(f"  - Draft Picks: {self.stats.draft_picks}")
         logger.info(f"📊 Total API requests made - Hour: {self.hourly_request_count}, Day: {self.daily_request_count}")
         
         return self.extracted_data
@@ -1217,24 +1649,16 @@ class YahooFantasyExtractor:
     def save_to_json(self, filename: str = 'yahoo_fantasy_data.json'):
         """Save extracted data to JSON file"""
         try:
-            # Convert datetime objects to strings for JSON serialization
-            json_data = {}
-            for key, value in self.extracted_data.items():
-                json_data[key] = []
-                for item in value:
-                    json_item = {}
-                    for k, v in item.items():
-                        if isinstance(v, datetime):
-                            json_item[k] = v.isoformat()
-                        else:
-                            json_item[k] = v
-                    json_data[key].append(json_item)
-            
-            with open(filename, 'w') as f:
-                json.dump(json_data, f, indent=2, default=str)
+            # Datetimes are encoded as ISO 8601 by the serializer (natively with orjson)
+            with open(filename, 'w', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+                dump_records_json(self.extracted_data, f, iso_datetimes=True)
             
             logger.info(f"💾 Data saved to {filename}")
             
+            # The full dataset is safely on disk, so the next run starts fresh
+            if os.path.exists(self.CHECKPOINT_FILE):
+                os.remove(self.CHECKPOINT_FILE)
+            
         except Exception as e:
             logger.error(f"Error saving data to JSON: {e}")
 
@@ -3,15 +3,23 @@
 Extract draft data for all leagues and merge with existing final dataset
 """
 
-import json
 import logging
+import os
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from .comprehensive_data_extractor import YahooFantasyExtractor
+from .comprehensive_data_extractor import YahooFantasyExtractor, JSON_WRITE_BUFFER_SIZE, dump_records_json
+from ..utils.json_io import load_json_file
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Leagues whose drafts are fetched concurrently; the extractor's rate limiter still spaces the requests
+DRAFT_WORKERS = int(os.getenv('DRAFT_EXTRACTION_WORKERS', '4'))
+# Leagues admitted ahead of the in-order consumer; bounds the draft payloads held in memory
+DRAFT_MAX_INFLIGHT = int(os.getenv('DRAFT_MAX_INFLIGHT', '32'))
+
 def main():
     """Extract draft data and merge with existing final dataset"""
     
@@ -23,8 +31,7 @@ def main():
     logger.info(f"📂 Loading existing dataset: {final_data_file}")
     
     try:
-        with open(final_data_file, 'r') as f:
-            final_data = json.load(f)
+        final_data = load_json_file(final_data_file)
         logger.info("✅ Successfully loaded existing dataset")
     except Exception as e:
         logger.error(f"❌ Error loading existing dataset: {e}")
@@ -43,44 +50,53 @@ def main():
     leagues = final_data.get('leagues', [])
     logger.info(f"📋 Found {len(leagues)} leagues to extract draft data from")
     
-    # Extract draft data for each league
+    # Extract draft data for each league, accumulating the draft analysis as picks arrive
     all_draft_picks = []
     successful_extractions = 0
-    
-    for i, league in enumerate(leagues, 1):
-        league_id = league['league_id']
-        league_name = league['name']
-        season = league['season']
-        
-        logger.info(f"🎯 Processing league {i}/{len(leagues)}: {league_name} ({season})")
+    auction_picks = 0
+    unique_player_ids = set()
+    positions = Counter()
+    rounds = Counter()
+    
+    # League drafts are independent, so overlap their request latency and consume results in league order
+    with ThreadPoolExecutor(max_workers=DRAFT_WORKERS) as executor:
+        # Submissions stay at most DRAFT_MAX_INFLIGHT leagues ahead, so finished-but-unread
+        # results can't pile up when Yahoo slows down and the consumer falls behind
+        draft_futures = deque(executor.submit(extractor.extract_draft_for_league, league['league_id'])
+                              for league in leagues[:DRAFT_MAX_INFLIGHT])
         
-        try:
-            # Extract draft data for this league
-            draft_picks = extractor.extract_draft_for_league(league_id)
+        for i, league in enumerate(leagues, 1):
+            draft_future = draft_futures.popleft()
+            next_index = i - 1 + DRAFT_MAX_INFLIGHT
+            if next_index < len(leagues):
+                draft_futures.append(executor.submit(extractor.extract_draft_for_league, leagues[next_index]['league_id']))
             
-            if draft_picks:
-                successful_extractions += 1
-                for pick in draft_picks:
-                    # Convert to dict with datetime serialization
-                    pick_dict = {}
-                    for k, v in pick.__dict__.items():
-                        if isinstance(v, datetime):
-                            pick_dict[k] = v.isoformat()
-                        else:
-                            pick_dict[k] = v
-                    all_draft_picks.append(pick_dict)
-                
-                logger.info(f"  ✅ Extracted {len(draft_picks)} draft picks")
-            else:
-                logger.info(f"  ⚠️ No draft picks found (likely older league)")
+            league_name = league['name']
+            season = league['season']
             
-            # Rate limiting
-            import time
-            time.sleep(0.3)
+            logger.info(f"🎯 Processing league {i}/{len(leagues)}: {league_name} ({season})")
             
-        except Exception as e:
-            logger.error(f"  ❌ Error extracting draft data for {league_name}: {e}")
-            continue
+            try:
+                # Draft data for this league
+                draft_picks = draft_future.result()
+                
+                if draft_picks:
+                    successful_extractions += 1
+                    # Datetimes are serialized as ISO 8601 when the dataset is saved
+                    all_draft_picks.extend(pick.__dict__ for pick in draft_picks)
+                    
+                    auction_picks += sum(pick.is_auction_draft for pick in draft_picks)
+                    unique_player_ids.update(pick.player_id for pick in draft_picks if pick.player_id)
+                    positions.update(pick.position for pick in draft_picks)
+                    rounds.update(pick.round_number for pick in draft_picks)
+                    
+                    logger.info(f"  ✅ Extracted {len(draft_picks)} draft picks")
+                else:
+                    logger.info(f"  ⚠️ No draft picks found (likely older league)")
+                
+            except Exception as e:
+                logger.error(f"  ❌ Error extracting draft data for {league_name}: {e}")
+                continue
     
     # Add draft_picks to final dataset
     final_data['draft_picks'] = all_draft_picks
@@ -91,8 +107,8 @@ def main():
     
     logger.info(f"💾 Saving updated dataset to {output_file}...")
     try:
-        with open(output_file, 'w') as f:
-            json.dump(final_data, f, indent=2, default=str)
+        with open(output_file, 'w', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+            record_counts = dump_records_json(final_data, f, iso_datetimes=True)
         logger.info("✅ Successfully saved updated dataset")
     except Exception as e:
         logger.error(f"❌ Error saving updated dataset: {e}")
@@ -112,47 +128,35 @@ def main():
     
     # Draft analysis
     if all_draft_picks:
-        auction_picks = sum(1 for pick in all_draft_picks if pick.get('is_auction_draft', False))
         snake_picks = len(all_draft_picks) - auction_picks
-        unique_players = len(set(pick.get('player_id') for pick in all_draft_picks if pick.get('player_id')))
         
         logger.info(f"🎯 Snake draft picks: {snake_picks:,}")
         logger.info(f"🎯 Auction draft picks: {auction_picks:,}")
-        logger.info(f"🎯 Unique players drafted: {unique_players:,}")
-        
-        # Position breakdown
-        positions = {}
-        for pick in all_draft_picks:
-            pos = pick.get('position', 'Unknown')
-            positions[pos] = positions.get(pos, 0) + 1
-        
-        logger.info(f"\n📊 Position breakdown:")
-        for pos, count in sorted(positions.items(), key=lambda x: x[1], reverse=True):
-            logger.info(f"  {pos}: {count:,} picks")
+        logger.info(f"🎯 Unique players drafted: {len(unique_player_ids):,}")
         
-        # Round breakdown
-        rounds = {}
-        for pick in all_draft_picks:
-            round_num = pick.get('round_number', 0)
-            rounds[round_num] = rounds.get(round_num, 0) + 1
-        
-        logger.info(f"\n📊 Top 5 rounds by pick count:")
-        for round_num, count in sorted(rounds.items(), key=lambda x: x[1], reverse=True)[:5]:
-            logger.info(f"  Round {round_num}: {count:,} picks")
+        # Position and round breakdowns, each built and emitted as a single log record
+        if logger.isEnabledFor(logging.INFO):
+            position_lines = [f"  {pos}: {count:,} picks"
+                              for pos, count in positions.most_common()]
+            logger.info("\n📊 Position breakdown:\n" + "\n".join(position_lines))
+            
+            round_lines = [f"  Round {round_num}: {count:,} picks"
+                           for round_num, count in rounds.most_common(5)]
+            logger.info("\n📊 Top 5 rounds by pick count:\n" + "\n".join(round_lines))
     
     # Final dataset summary
-    total_records = sum(len(final_data.get(table, [])) for table in ['leagues', 'teams', 'rosters', 'matchups', 'transactions', 'draft_picks'])
+    counts = {table: record_counts.get(table, 0) for table in ['leagues', 'teams', 'rosters', 'matchups', 'transactions', 'draft_picks']}
     logger.info(f"\n📈 UPDATED DATASET SUMMARY:")
-    logger.info(f"  - Leagues: {len(final_data.get('leagues', [])):,}")
-    logger.info(f"  - Teams: {len(final_data.get('teams', [])):,}")
-    logger.info(f"  - Rosters: {len(final_data.get('rosters', [])):,}")
-    logger.info(f"  - Matchups: {len(final_data.get('matchups', [])):,}")
-    logger.info(f"  - Transactions: {len(final_data.get('transactions', [])):,}")
-    logger.info(f"  - Draft Picks: {len(final_data.get('draft_picks', [])):,}")
-    logger.info(f"📈 TOTAL RECORDS: {total_records:,}")
+    logger.info(f"  - Leagues: {counts['leagues']:,}")
+    logger.info(f"  - Teams: {counts['teams']:,}")
+    logger.info(f"  - Rosters: {counts['rosters']:,}")
+    logger.info(f"  - Matchups: {counts['matchups']:,}")
+    logger.info(f"  - Transactions: {counts['transactions']:,}")
+    logger.info(f"  - Draft Picks: {counts['draft_picks']:,}")
+    logger.info(f"📈 TOTAL RECORDS: {sum(counts.values()):,}")
     
     # File size
-    file_size_mb = len(json.dumps(final_data, default=str)) / (1024 * 1024)
+    file_size_mb = os.path.getsize(output_file) / (1024 * 1024)
     logger.info(f"\n💾 Updated dataset saved to: {output_file}")
     logger.info(f"💾 File size: {file_size_mb:.1f} MB")
     logger.info(f"🚀 Ready for Heroku deployment with draft data!")
@@ -4,13 +4,13 @@ Incremental Fantasy Football Data Extraction
 Captures all new data since last extraction - the primary production system
 """
 
-import json
 import logging
-import time
 import glob
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from .comprehensive_data_extractor import YahooFantasyExtractor
+from .comprehensive_data_extractor import YahooFantasyExtractor, JSON_WRITE_BUFFER_SIZE, dump_records_json
+from ..utils.json_io import load_json_file
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,6 +19,9 @@ logger = logging.getLogger(__name__)
 class IncrementalDataExtractor:
     """Production incremental fantasy football data extractor"""
     
+    # Concurrent league lookups - kept small to stay friendly with Yahoo rate limits
+    MAX_LEAGUE_WORKERS = 4
+    
     def __init__(self):
         self.extractor = YahooFantasyExtractor()
         self.start_time = datetime.now()
@@ -66,8 +69,7 @@ class IncrementalDataExtractor:
             latest_file = max(files, key=lambda x: x.split('_')[-1])
             logger.info(f"📂 Loading previous extraction: {latest_file}")
             
-            with open(latest_file, 'r') as f:
-                self.last_extraction_data = json.load(f)
+            self.last_extraction_data = load_json_file(latest_file)
             
             # Log what we have as baseline
             total_records = sum(len(self.last_extraction_data.get(table, [])) for table in 
@@ -137,10 +139,9 @@ class IncrementalDataExtractor:
     def get_incremental_matchups(self, league_id, current_week):
         """Get only recent/current matchups"""
         try:
-            matchups = self.extractor.extract_matchups_for_league(league_id)
-            
-            # Get current week and recent completed matchups
-            recent_matchups = [m for m in matchups if m.week >= max(1, current_week - 2)]
+            # Request only the current week and the two before it instead of the whole season
+            recent_weeks = list(range(max(1, current_week - 2), current_week + 1))
+            recent_matchups = self.extractor.extract_matchups_for_league(league_id, weeks_to_extract=recent_weeks)
             
             logger.info(f"  🏆 Found {len(recent_matchups)} recent matchups")
             return recent_matchups
@@ -173,8 +174,6 @@ class IncrementalDataExtractor:
                 else:
                     logger.info(f"    ⚠️ No draft data found")
                 
-                time.sleep(0.3)  # Rate limiting
-                
             except Exception as e:
                 logger.error(f"    ❌ Error extracting drafts for {league_name}: {e}")
                 continue
@@ -205,38 +204,27 @@ class IncrementalDataExtractor:
             
             logger.info(f"📊 Found {len(league_ids)} leagues for {current_season}")
             
-            # Get detailed info for current season leagues only
+            # Refresh the token once up front so worker threads don't race to refresh it
+            # (through the file-locked shared session, so other processes don't either)
+            self.extractor.refresh_token_if_expired()
+            game_id = self.extractor.game.game_id()
+            
+            # Probe league details concurrently - each league is several independent round-trips
+            with ThreadPoolExecutor(max_workers=self.MAX_LEAGUE_WORKERS) as executor:
+                league_infos = list(executor.map(
+                    lambda league_id: self.get_league_info(league_id, current_season, game_id), league_ids))
+            
             active_leagues = []
-            for league_id in league_ids:
-                try:
-                    league = self.extractor.game.to_league(league_id)
-                    league_info = {
-                        'league_id': str(league_id),
-                        'name': getattr(league, 'name', lambda: f'League {league_id}')(),
-                        'season': str(current_season),
-                        'game_code': 'nfl',
-                        'game_id': self.extractor.game.game_id(),
-                        'num_teams': len(league.teams()),
-                        'current_week': league.current_week(),
-                        'start_week': league.start_week(),
-                        'end_week': league.end_week(),
-                        'league_type': 'private',
-                        'draft_status': league.draft_status(),
-                        'is_pro_league': False,
-                        'is_cash_league': False,
-                        'url': f"https://football.fantasysports.yahoo.com/f1/{league_id}"
-                    }
-                    
-                    # Only include post-draft leagues
-                    if league_info.get('draft_status') == 'postdraft':
-                        active_leagues.append(league_info)
-                        logger.info(f"  ✅ {league_info['name']}")
-                    else:
-                        logger.info(f"  ⏸️ {league_info['name']} (draft status: {league_info.get('draft_status')})")
-                        
-                except Exception as e:
-                    logger.error(f"  ❌ Error getting league {league_id}: {e}")
+            for league_info in league_infos:
+                if league_info is None:
                     continue
+                
+                # Only include post-draft leagues
+                if league_info.get('draft_status') == 'postdraft':
+                    active_leagues.append(league_info)
+                    logger.info(f"  ✅ {league_info['name']}")
+                else:
+                    logger.info(f"  ⏸️ {league_info['name']} (draft status: {league_info.get('draft_status')})")
             
             logger.info(f"📊 Found {len(active_leagues)} ACTIVE leagues for {current_season}")
             return active_leagues
@@ -245,22 +233,33 @@ class IncrementalDataExtractor:
             logger.error(f"❌ Error getting current season leagues: {e}")
             return []
     
-    def serialize_data(self, data):
-        """Convert datetime objects for JSON serialization"""
-        def serialize_datetime(obj):
-            return obj.isoformat() if isinstance(obj, datetime) else obj
-        
-        json_data = {}
-        for key, value in data.items():
-            json_data[key] = []
-            for item in value:
-                if isinstance(item, dict):
-                    json_item = {k: serialize_datetime(v) for k, v in item.items()}
-                else:
-                    json_item = {k: serialize_datetime(v) for k, v in item.__dict__.items()}
-                json_data[key].append(json_item)
-        
-        return json_data
+    def get_league_info(self, league_id, current_season, game_id):
+        """Fetch summary info for a single league (None on failure)"""
+        try:
+            # League object, teams and settings go through the extractor's per-league caches,
+            # so the extraction that follows reuses them instead of refetching
+            league = self.extractor._get_league(league_id)
+            settings = self.extractor._get_league_settings(league, league_id)
+            teams = self.extractor._get_league_teams(league, league_id)
+            return {
+                'league_id': str(league_id),
+                'name': settings.get('name') or f'League {league_id}',
+                'season': str(current_season),
+                'game_code': 'nfl',
+                'game_id': game_id,
+                'num_teams': len(teams),
+                'current_week': int(settings.get('current_week', 1)),
+                'start_week': int(settings.get('start_week', 1)),
+                'end_week': int(settings.get('end_week', 17)),
+                'league_type': 'private',
+                'draft_status': settings.get('draft_status'),
+                'is_pro_league': False,
+                'is_cash_league': False,
+                'url': f"https://football.fantasysports.yahoo.com/f1/{league_id}"
+            }
+        except Exception as e:
+            logger.error(f"  ❌ Error getting league {league_id}: {e}")
+            return None
     
     def merge_with_baseline(self, incremental_data):
         """Merge incremental data with baseline dataset"""
@@ -300,8 +299,9 @@ class IncrementalDataExtractor:
             filename = f'data/current/yahoo_fantasy_COMPLETE_with_drafts_{timestamp}.json'
         
         logger.info(f"💾 Saving results to {filename}...")
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        with open(filename, 'w', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+            # Dataclass records and datetimes are encoded by the serializer itself
+            dump_records_json(data, f, iso_datetimes=True)
         
         return filename
     
@@ -309,7 +309,7 @@ class IncrementalDataExtractor:
         """Log extraction summary"""
         runtime = datetime.now() - self.start_time
         total_records = sum(len(data.get(table, [])) for table in data.keys())
-        file_size_mb = len(json.dumps(data, default=str)) / (1024 * 1024)
+        file_size_mb = os.path.getsize(filename) / (1024 * 1024)
         
         extraction_type = "INCREMENTAL" if is_incremental else "COMPLETE"
         
@@ -391,15 +391,12 @@ class IncrementalDataExtractor:
                 
                 # Get incremental matchups (recent weeks)
                 matchups = self.get_incremental_matchups(league_id, current_week)
-                incremental_data['matchups'].extend([matchup.__dict__ for matchup in matchups])
+                incremental_data['matchups'].extend(matchups)  # Already plain week records
                 
                 # Get incremental transactions (last 30 days)
                 transactions = self.get_incremental_transactions(league_id)
                 incremental_data['transactions'].extend([transaction.__dict__ for transaction in transactions])
                 
-                # Rate limiting
-                time.sleep(0.3)
-                
             except Exception as e:
                 logger.error(f"❌ Error processing league {league_name}: {e}")
                 continue
@@ -411,12 +408,11 @@ class IncrementalDataExtractor:
         # Merge with baseline data to create complete dataset
         complete_data = self.merge_with_baseline(incremental_data)
         
-        # Serialize and save data
-        json_data = self.serialize_data(complete_data)
-        filename = self.save_results(json_data, is_incremental=False)
+        # Save data
+        filename = self.save_results(complete_data, is_incremental=False)
         
         # Log summary
-        self.log_summary(json_data, active_leagues, filename, is_incremental=True)
+        self.log_summary(complete_data, active_leagues, filename, is_incremental=True)
         
         return filename
 
@@ -6,11 +6,17 @@ Loads extracted JSON data into a relational database
 
 import json
 import logging
+import os
 import sys
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+import numpy as np
 import pandas as pd
 
+# Make the project root importable when run as a script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from src.utils.json_io import load_json_file
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +24,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def sql_literal(value: Any) -> str:
+    """Render a Python value as an escaped SQL literal"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    # Escape single quotes and wrap in quotes
+    escaped_value = str(value).replace("'", "''")
+    return f"'{escaped_value}'"
+
 class YahooFantasyDatabaseLoader:
     """Database loader for Yahoo Fantasy data"""
     
@@ -37,8 +55,7 @@ class YahooFantasyDatabaseLoader:
         try:
             logger.info(f"📂 Loading data from {self.data_file}...")
             
-            with open(self.data_file, 'r') as f:
-                self.data = json.load(f)
+            self.data = load_json_file(self.data_file)
             
             logger.info("✅ Data loaded successfully!")
             logger.info(f"📊 Data Summary:")
@@ -178,26 +195,14 @@ class YahooFantasyDatabaseLoader:
                         # Get column names from first record
                         columns = list(records[0].keys())
                         
-                        for record in records:
-                            # Prepare values
-                            values = []
-                            for col in columns:
-                                value = record.get(col)
-                                if value is None:
-                                    values.append("NULL")
-                                elif isinstance(value, bool):
-                                    values.append("TRUE" if value else "FALSE")
-                                elif isinstance(value, (int, float)):
-                                    values.append(str(value))
-                                else:
-                                    # Escape single quotes and wrap in quotes
-                                    escaped_value = str(value).replace("'", "''")
-                                    values.append(f"'{escaped_value}'")
-                            
-                            # Generate INSERT statement
-                            column_list = ", ".join(columns)
-                            value_list = ", ".join(values)
-                            f.write(f"INSERT INTO {table_name} ({column_list}) VALUES ({value_list});\n")
+                        # Statement prefix is the same for every record in the table
+                        insert_prefix = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ("
+                        
+                        # Generate INSERT statements, joining each row's escaped values in one pass
+                        f.writelines(
+                            insert_prefix + ", ".join([sql_literal(record.get(col)) for col in columns]) + ");\n"
+                            for record in records
+                        )
                     
                     f.write("\n")
             
@@ -229,33 +234,31 @@ class YahooFantasyDatabaseLoader:
                 if 'leagues' in self.data and self.data['leagues']:
                     f.write("\n## League Analysis\n\n")
                     
-                    # Group by season
-                    leagues_by_season = {}
-                    for league in self.data['leagues']:
-                        season = league.get('season', 'Unknown')
-                        if season not in leagues_by_season:
-                            leagues_by_season[season] = []
-                        leagues_by_season[season].append(league)
+                    # Group by season in one vectorized pass, materializing only the fields we report
+                    leagues_df = pd.DataFrame(self.data['leagues'],
+                                              columns=['season', 'name', 'num_teams', 'league_type'])
+                    leagues_df['season'] = leagues_df['season'].fillna('Unknown').astype(str)
+                    leagues_df['num_teams'] = pd.to_numeric(leagues_df['num_teams'], errors='coerce').fillna(0).astype(int)
+                    leagues_df = leagues_df.sort_values('season', kind='stable')
+                    
+                    season_stats = leagues_df.groupby('season', sort=True).agg(
+                        league_count=('season', 'size'),
+                        total_teams=('num_teams', 'sum'))
                     
                     f.write("### Leagues by Season\n\n")
                     f.write("| Season | Leagues | Total Teams |\n")
                     f.write("|--------|---------|------------|\n")
                     
-                    for season in sorted(leagues_by_season.keys()):
-                        league_count = len(leagues_by_season[season])
-                        total_teams = sum(int(league.get('num_teams', 0)) for league in leagues_by_season[season])
-                        f.write(f"| {season} | {league_count} | {total_teams} |\n")
+                    for season, row in season_stats.iterrows():
+                        f.write(f"| {season} | {row['league_count']} | {row['total_teams']} |\n")
                     
                     f.write("\n### League Details\n\n")
                     f.write("| Season | League Name | Teams | Type |\n")
                     f.write("|--------|-------------|-------|------|\n")
                     
-                    for season in sorted(leagues_by_season.keys()):
-                        for league in leagues_by_season[season]:
-                            name = league.get('name', 'Unknown')
-                            teams = league.get('num_teams', 0)
-                            league_type = league.get('league_type', 'Unknown')
-                            f.write(f"| {season} | {name} | {teams} | {league_type} |\n")
+                    leagues_df = leagues_df.fillna({'name': 'Unknown', 'league_type': 'Unknown'})
+                    for season, name, teams, league_type in leagues_df.itertuples(index=False):
+                        f.write(f"| {season} | {name} | {teams} | {league_type} |\n")
                 
                 # Team analysis
                 if 'teams' in self.data and self.data['teams']:
@@ -264,12 +267,15 @@ class YahooFantasyDatabaseLoader:
                     total_teams = len(self.data['teams'])
                     f.write(f"**Total Teams:** {total_teams:,}\n\n")
                     
-                    # Calculate statistics
-                    points_for = [float(team.get('points_for', 0)) for team in self.data['teams'] if team.get('points_for')]
-                    if points_for:
-                        avg_points = sum(points_for) / len(points_for)
-                        max_points = max(points_for)
-                        min_points = min(points_for)
+                    # Calculate statistics over a flat float array (teams without points excluded)
+                    points_for = np.fromiter(
+                        (float(team.get('points_for') or 0) for team in self.data['teams']),
+                        dtype=np.float64, count=total_teams)
+                    points_for = points_for[points_for != 0]
+                    if points_for.size:
+                        avg_points = points_for.mean()
+                        max_points = points_for.max()
+                        min_points = points_for.min()
                         
                         f.write("### Scoring Statistics\n\n")
                         f.write(f"- **Average Points For:** {avg_points:.1f}\n")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+JSON File Loading for Yahoo Fantasy Data
+Shared loader for extraction files, using orjson when it is installed
+"""
+
+import json
+import mmap
+import os
+from typing import Any
+
+try:
+    import orjson  # Optional: much faster parsing/serialization of large extraction files
+except ImportError:
+    orjson = None
+
+def load_json_file(filename: str) -> Any:
+    """Load a JSON file, using orjson when it is installed
+
+    With orjson the file is memory-mapped and parsed in place, so large
+    extraction files are not first copied into a bytes object.
+    """
+    if orjson is not None:
+        with open(filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(f.read())  # mmap cannot map an empty file; raises JSONDecodeError
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(filename, 'r') as f:
+        return json.load(f)
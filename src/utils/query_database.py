@@ -5,12 +5,29 @@ Run SQL queries against the deployed Yahoo Fantasy dataset
 """
 
 import os
+import re
 import sys
 import pandas as pd
 from sqlalchemy import create_engine, text
 
-def run_query(query, database_url=None):
-    """Run a SQL query and return results"""
+# Statements allowed unless --allow-writes is passed. The leading-keyword check is only a fast
+# pre-check with a clear message: writes can hide later in the query (a data-modifying CTE,
+# EXPLAIN ANALYZE, SELECT INTO, a second statement), so run_query also runs it in a read-only
+# transaction and leaves the real enforcement to the database
+READ_ONLY_KEYWORDS = frozenset({'SELECT', 'WITH', 'SHOW', 'EXPLAIN', 'VALUES', 'TABLE'})
+LEADING_KEYWORD = re.compile(r'(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*\(?\s*([A-Za-z]+)', re.DOTALL)
+
+def is_read_only_query(query):
+    """Check that the query starts with a read-only keyword (after any comments)"""
+    match = LEADING_KEYWORD.match(query)
+    return bool(match) and match.group(1).upper() in READ_ONLY_KEYWORDS
+
+def run_query(query, database_url=None, max_rows=10000, allow_writes=False):
+    """Run a SQL query and return results (at most max_rows rows)"""
+    
+    if not allow_writes and not is_read_only_query(query):
+        print("❌ Only read-only queries (SELECT, WITH, SHOW, EXPLAIN, VALUES, TABLE) are allowed. Use --allow-writes to override.")
+        return None
     
     # Get database URL
     db_url = database_url or os.getenv('DATABASE_URL')
@@ -29,10 +46,33 @@ def run_query(query, database_url=None):
         print(f"🔍 Running query: {query}")
         print("=" * 60)
         
-        # Execute query and get results as DataFrame
-        df = pd.read_sql_query(query, engine)
+        # Fetch at most max_rows + 1 rows. Read-only queries go through a server-side cursor,
+        # so an unbounded query can't pull the whole result set into memory; with --allow-writes
+        # a plain cursor is used, since Postgres can't DECLARE a cursor for INSERT ... RETURNING
+        if allow_writes:
+            execution_options = {}
+        else:
+            # Let the database enforce read-only: any write fails inside a READ ONLY transaction
+            execution_options = {'stream_results': True, 'postgresql_readonly': True}
+        
+        with engine.connect().execution_options(**execution_options) as conn:
+            result = conn.execute(text(query))
+            if result.returns_rows:
+                rows = result.fetchmany(max_rows + 1)
+                columns = list(result.keys())
+            else:
+                rows, columns = [], []
+            
+            if allow_writes:
+                # Commit writes whether or not they return rows (e.g. UPDATE ... RETURNING)
+                conn.commit()
+        
+        truncated = len(rows) > max_rows
+        df = pd.DataFrame(rows[:max_rows], columns=columns)
         
         print(f"📊 Results: {len(df)} rows")
+        if truncated:
+            print(f"⚠️ Output truncated to the first {max_rows:,} rows (use --max-rows to raise the limit)")
         print("=" * 60)
         
         # Display results
@@ -62,6 +102,10 @@ def main():
                        help='SQL query to run')
     parser.add_argument('--database-url', 
                        help='Database URL (or use DATABASE_URL env var)')
+    parser.add_argument('--max-rows', type=int, default=10000,
+                       help='Maximum number of rows to fetch (default: 10000)')
+    parser.add_argument('--allow-writes', action='store_true',
+                       help='Allow statements other than read-only queries')
     
     args = parser.parse_args()
     
@@ -69,7 +113,7 @@ def main():
     print("=" * 40)
     
     # Run the query
-    result = run_query(args.query, args.database_url)
+    result = run_query(args.query, args.database_url, args.max_rows, args.allow_writes)
     
     if result is not None:
         print(f"\n✅ Query completed successfully!")